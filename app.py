@@ -116,7 +116,11 @@ def show_tournament_view():
     st.divider()
     
     # Get field with predictions
-    field_df = st.session_state.predictor.get_ranked_field(tournament_info)
+    field_df = st.session_state.predictor.get_ranked_field(
+        tournament_info,
+        data_fetcher=st.session_state.data_fetcher,
+        db_manager=st.session_state.db_manager
+    )
     
     if field_df.empty:
         st.info("Field not yet available for this tournament.")
@@ -487,8 +491,8 @@ def show_tournament_view():
     st.subheader("Tournament Field")
     st.caption("💡 To make your pick: expand a player card below and click ✅ Select Player")
     
-    # Create columns for player cards
-    for idx, row in field_df.iterrows():
+    # Create columns for player cards - plain dicts, not a Series per row
+    for row in field_df.to_dict('records'):
         player_card(row, tournament_info)
 
 def player_card(player_data, tournament_info):
@@ -583,17 +587,17 @@ def player_card(player_data, tournament_info):
         st.subheader(f"🏆 {tournament_name} History")
         
         # Show aggregated summary first
-        course_history = player_stats.get('course_history', pd.DataFrame())
-        if not course_history.empty:
+        course_history = player_stats.get('course_history', {})
+        if course_history:
             st.write(f"**Career Summary at {tournament_name}:**")
-            st.dataframe(course_history, use_container_width=True, hide_index=True)
+            st.dataframe(pd.DataFrame([course_history]), use_container_width=True, hide_index=True)
         
         # Show detailed year-by-year history
         detailed_history = player_stats.get('detailed_course_history', pd.DataFrame())
         if not detailed_history.empty:
             st.write("**Year-by-Year Results:**")
             st.dataframe(detailed_history, use_container_width=True, hide_index=True)
-        elif course_history.empty:
+        elif not course_history:
             st.info(f"No history at {tournament_name}")
         
         # Action buttons
@@ -712,9 +716,9 @@ def display_full_player_stats(player_data):
     
     # Course history
     st.subheader("Course History (This Week's Venue)")
-    course_history_df = player_data.get('course_history', pd.DataFrame())
-    if not course_history_df.empty:
-        st.dataframe(course_history_df, use_container_width=True)
+    course_history = player_data.get('course_history', {})
+    if course_history:
+        st.dataframe(pd.DataFrame([course_history]), use_container_width=True)
     else:
         st.info("No course history available.")
 
@@ -57,6 +57,12 @@ class ESPNGolfAPIScraper:
                 )
             """)
             
+            # Latest tournament date (weekly_check.py) comes from the index
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trr_date
+                ON tournament_results_2026(tournament_date DESC)
+            """)
+            
             # Player recent form
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS player_recent_form (
@@ -13,11 +13,97 @@ Usage: python scrape_pgatour_api.py
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sqlite3
 from pathlib import Path
 from datetime import datetime
 import time
 import json
+import hashlib
+import bisect
+import numpy as np
+
+from utils.database import checkpoint_wal
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+_MONTHS = {
+    'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
+}
+
+# Prepared once per run and reused by executemany for every row
+_INSERT_RESULT_SQL = """
+    INSERT OR REPLACE INTO tournament_results_2026
+    (player_name, tournament_name, tournament_id, finish_position,
+     score_to_par, total_strokes, round1, round2, round3, round4,
+     earnings, fedex_points, made_cut, tournament_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_FORM_SQL = """
+    INSERT OR REPLACE INTO player_recent_form
+    (player_name, events_played, avg_finish, avg_sg_total,
+     best_finish, cuts_made, top_10s, form_rating, last_updated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_STATS_SQL = """
+    INSERT OR REPLACE INTO player_stats
+    (player_name, fedex_rank, season_money, sg_total, last_updated)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_FIELD_SQL = """
+    INSERT OR REPLACE INTO tournament_field
+    (player_name, fedex_rank, last_updated)
+    VALUES (?, ?, ?)
+"""
+
+# scrape_tournament result for a tournament whose tournsum.json has not
+# changed since the last run - distinct from 0, which means nothing imported
+_UNCHANGED = -1
+
+def _utc_timestamp():
+    """Current UTC time in SQLite CURRENT_TIMESTAMP format, bound once per batch"""
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+def _to_int(value):
+    """Parse an int from the API ('-12', '+3', 68) - None if not a number"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        text = value.strip()
+        digits = text[1:] if text[:1] in ('+', '-') else text
+        if digits.isdecimal():
+            return int(text)
+    return None
+
+def _finish_num(finish):
+    """Numeric finish from a position string ('T5' -> 5) - NaN for MC/WD/DQ etc."""
+    if not finish:
+        return np.nan
+    text = str(finish).replace('T', '')
+    return int(text) if text.isdecimal() else np.nan
+
+def _to_float_money(value):
+    """Parse a money or points value ('$1,500,000', '500.5', 300) - 0 if not a number"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.replace('$', '').replace(',', '').strip()
+        digits = text[1:] if text[:1] in ('+', '-') else text
+        if digits.replace('.', '', 1).isdecimal():
+            return float(text)
+    return 0
 
 class PGATourAPIScraper:
     """Scrape PGA Tour data using JSON API"""
@@ -27,8 +113,19 @@ class PGATourAPIScraper:
         self.base_url = "https://www.pgatour.com"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Connection': 'keep-alive'
         })
+        # Every request goes to the same host, so one pooled keep-alive
+        # connection carries all tournaments after the first TLS handshake
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        # One connection for the whole run - opened once, committed per tournament
+        self.conn = self._connect()
         self.init_tables()
         
         # 2026 Tournament IDs (from PGA Tour API)
@@ -43,81 +140,113 @@ class PGATourAPIScraper:
             {'name': 'The Mexico Open', 'id': '540', 'dates': 'Feb 27 - Mar 2', 'course': 'Vidanta Vallarta'},
         ]
     
+    def _connect(self):
+        """Open the long-lived database connection"""
+        return sqlite3.connect(self.db_path)
+    
+    def close(self):
+        """Checkpoint any WAL into the database file and close the connection"""
+        checkpoint_wal(self.conn, "TRUNCATE")
+        self.conn.close()
+    
     def init_tables(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 2026 tournament results
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tournament_results_2026 (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    tournament_name TEXT NOT NULL,
-                    tournament_id TEXT,
-                    finish_position TEXT,
-                    score_to_par INTEGER,
-                    total_strokes INTEGER,
-                    round1 INTEGER,
-                    round2 INTEGER,
-                    round3 INTEGER,
-                    round4 INTEGER,
-                    earnings REAL,
-                    fedex_points REAL,
-                    sg_total REAL,
-                    sg_ott REAL,
-                    sg_app REAL,
-                    sg_arg REAL,
-                    sg_putt REAL,
-                    made_cut BOOLEAN,
-                    tournament_date DATE,
-                    UNIQUE(player_name, tournament_name)
-                )
-            """)
-            
-            # Player recent form
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS player_recent_form (
-                    player_name TEXT PRIMARY KEY,
-                    events_played INTEGER,
-                    avg_finish REAL,
-                    avg_sg_total REAL,
-                    best_finish TEXT,
-                    cuts_made INTEGER,
-                    top_10s INTEGER,
-                    form_rating TEXT,
-                    last_updated TIMESTAMP
-                )
-            """)
-            
-            # Current season stats (FedEx Cup, money, etc.)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS player_stats (
-                    player_name TEXT PRIMARY KEY,
-                    fedex_rank INTEGER,
-                    world_rank INTEGER,
-                    season_money REAL,
-                    sg_total REAL,
-                    sg_ott REAL,
-                    sg_app REAL,
-                    sg_arg REAL,
-                    sg_putt REAL,
-                    last_updated TIMESTAMP
-                )
-            """)
-            
-            # Tournament field
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tournament_field (
-                    player_name TEXT PRIMARY KEY,
-                    fedex_rank INTEGER,
-                    world_rank INTEGER,
-                    last_updated TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            print("✅ Database tables initialized")
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # 2026 tournament results
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_results_2026 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_name TEXT NOT NULL,
+                tournament_name TEXT NOT NULL,
+                tournament_id TEXT,
+                finish_position TEXT,
+                score_to_par INTEGER,
+                total_strokes INTEGER,
+                round1 INTEGER,
+                round2 INTEGER,
+                round3 INTEGER,
+                round4 INTEGER,
+                earnings REAL,
+                fedex_points REAL,
+                sg_total REAL,
+                sg_ott REAL,
+                sg_app REAL,
+                sg_arg REAL,
+                sg_putt REAL,
+                made_cut BOOLEAN,
+                tournament_date DATE,
+                UNIQUE(player_name, tournament_name)
+            )
+        """)
+        
+        # Recent-form lookups walk each player's results newest first
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_player_date
+            ON tournament_results_2026(player_name, tournament_date DESC)
+        """)
+        
+        # Latest tournament date (weekly_check.py) comes from the index
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trr_date
+            ON tournament_results_2026(tournament_date DESC)
+        """)
+        
+        # Player recent form
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_recent_form (
+                player_name TEXT PRIMARY KEY,
+                events_played INTEGER,
+                avg_finish REAL,
+                avg_sg_total REAL,
+                best_finish TEXT,
+                cuts_made INTEGER,
+                top_10s INTEGER,
+                form_rating TEXT,
+                last_updated TIMESTAMP
+            )
+        """)
+        
+        # Current season stats (FedEx Cup, money, etc.)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_stats (
+                player_name TEXT PRIMARY KEY,
+                fedex_rank INTEGER,
+                world_rank INTEGER,
+                season_money REAL,
+                sg_total REAL,
+                sg_ott REAL,
+                sg_app REAL,
+                sg_arg REAL,
+                sg_putt REAL,
+                last_updated TIMESTAMP
+            )
+        """)
+        
+        # Tournament field
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_field (
+                player_name TEXT PRIMARY KEY,
+                fedex_rank INTEGER,
+                world_rank INTEGER,
+                last_updated TIMESTAMP
+            )
+        """)
+        
+        # HTTP validators for tournsum.json (skip unchanged tournaments)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_sha256 TEXT,
+                fetched_at TIMESTAMP
+            )
+        """)
+        
+        conn.commit()
+        print("✅ Database tables initialized")
     
     def scrape_all_2026_tournaments(self):
         """Scrape all completed 2026 tournaments"""
@@ -128,6 +257,7 @@ class PGATourAPIScraper:
         print("This is fast and reliable! ⚡")
         
         total_results = 0
+        unchanged = 0
         
         for tournament in self.tournaments_2026:
             print(f"\n{'='*60}")
@@ -135,7 +265,18 @@ class PGATourAPIScraper:
             print(f"{'='*60}")
             
             results = self.scrape_tournament(tournament)
+            # Commit each tournament on its own, so the write lock is never
+            # held across the fetches and sleeps - a tournament that failed
+            # part-way leaves none of its rows behind
             if results > 0:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+            
+            if results == _UNCHANGED:
+                unchanged += 1
+                print(f"⏭️  Unchanged, skipping")
+            elif results > 0:
                 total_results += results
                 print(f"✅ Imported {results} player results")
             else:
@@ -145,6 +286,8 @@ class PGATourAPIScraper:
         
         print(f"\n{'='*60}")
         print(f"✅ COMPLETE: {total_results} total results imported")
+        if unchanged:
+            print(f"⏭️  {unchanged} tournaments unchanged since last run")
         print(f"{'='*60}")
         
         # Calculate recent form
@@ -156,7 +299,10 @@ class PGATourAPIScraper:
             print(f"\n📊 Updating season stats...")
             self.update_season_stats()
         
-        return total_results
+        # Form and stats are rebuilt from the committed results in one transaction
+        self.conn.commit()
+        
+        return total_results, unchanged
     
     def scrape_tournament(self, tournament):
         """Scrape single tournament from JSON API"""
@@ -166,14 +312,34 @@ class PGATourAPIScraper:
             
             print(f"   Fetching: {url}")
             
-            response = self.session.get(url, timeout=15)
+            # Conditional GET - completed tournaments never change
+            cached = self._get_http_cache(url)
+            headers = {}
+            if cached:
+                etag, last_modified, body_sha256 = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            response = self.session.get(url, headers=headers, timeout=15)
+            
+            if response.status_code == 304:
+                print(f"   Not modified since last run")
+                return _UNCHANGED
             
             if response.status_code != 200:
                 print(f"   Status: {response.status_code} - Tournament may not be completed yet")
                 return 0
             
-            # Parse JSON
-            data = response.json()
+            # Some servers ignore validators, so also compare the body itself
+            body_sha256 = hashlib.sha256(response.content).hexdigest()
+            if cached and cached[2] == body_sha256:
+                print(f"   Body matches last run")
+                return _UNCHANGED
+            
+            # Parse JSON (orjson reads the raw bytes directly, skipping the text decode)
+            data = orjson.loads(response.content) if HAS_ORJSON else response.json()
             
             # Navigate JSON structure
             # Structure: data['years'][0]['tours'][0]['trns'][0]['plrs']
@@ -183,86 +349,24 @@ class PGATourAPIScraper:
                 tournament_data = tour_data['trns'][0]
                 players = tournament_data.get('plrs', [])
                 
+                # Tournament date (estimate from tournament dates)
+                tournament_date = self._parse_date(tournament['dates'])
+                
                 if not players:
                     print(f"   No player data found")
                     return 0
                 
                 print(f"   Found {len(players)} players")
                 
-                # Import to database
-                imported = 0
-                with sqlite3.connect(self.db_path) as conn:
-                    for player in players:
-                        try:
-                            # Extract player info
-                            player_name = player.get('name', '').strip()
-                            if not player_name:
-                                continue
-                            
-                            # Position/finish
-                            position = player.get('pos', '')
-                            
-                            # Score
-                            total_score = player.get('tot', '')
-                            score_to_par = None
-                            if total_score:
-                                try:
-                                    score_to_par = int(total_score)
-                                except:
-                                    pass
-                            
-                            # Rounds
-                            rounds = player.get('rnds', [])
-                            round1 = int(rounds[0]) if len(rounds) > 0 and rounds[0] else None
-                            round2 = int(rounds[1]) if len(rounds) > 1 and rounds[1] else None
-                            round3 = int(rounds[2]) if len(rounds) > 2 and rounds[2] else None
-                            round4 = int(rounds[3]) if len(rounds) > 3 and rounds[3] else None
-                            
-                            # Total strokes
-                            total_strokes = None
-                            if all(r for r in [round1, round2, round3, round4]):
-                                total_strokes = round1 + round2 + round3 + round4
-                            
-                            # Money
-                            earnings = player.get('money', 0)
-                            if earnings:
-                                try:
-                                    earnings = float(str(earnings).replace('$', '').replace(',', ''))
-                                except:
-                                    earnings = 0
-                            
-                            # FedEx points
-                            fedex_points = player.get('pts', 0)
-                            if fedex_points:
-                                try:
-                                    fedex_points = float(fedex_points)
-                                except:
-                                    fedex_points = 0
-                            
-                            # Made cut
-                            made_cut = position not in ['MC', 'WD', 'DQ', 'CUT'] if position else False
-                            
-                            # Tournament date (estimate from tournament dates)
-                            tournament_date = self._parse_date(tournament['dates'])
-                            
-                            # Insert
-                            conn.execute("""
-                                INSERT OR REPLACE INTO tournament_results_2026
-                                (player_name, tournament_name, tournament_id, finish_position,
-                                 score_to_par, total_strokes, round1, round2, round3, round4,
-                                 earnings, fedex_points, made_cut, tournament_date)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (player_name, tournament['name'], tournament['id'], position,
-                                  score_to_par, total_strokes, round1, round2, round3, round4,
-                                  earnings, fedex_points, made_cut, tournament_date))
-                            
-                            imported += 1
-                            
-                        except Exception as e:
-                            print(f"   Error importing {player.get('name', 'unknown')}: {e}")
-                            continue
-                    
-                    conn.commit()
+                # Import to database - one prepared statement for the whole tournament
+                cursor = self.conn.executemany(
+                    _INSERT_RESULT_SQL,
+                    self._iter_result_rows(tournament, players, tournament_date)
+                )
+                imported = cursor.rowcount
+                
+                if imported:
+                    self._save_http_cache(url, response, body_sha256)
                 
                 return imported
                 
@@ -274,82 +378,133 @@ class PGATourAPIScraper:
             print(f"   Error: {e}")
             return 0
     
-    def _parse_date(self, date_str):
-        """Parse tournament date string to YYYY-MM-DD"""
-        # e.g., "Jan 2-5" -> "2026-01-05"
-        try:
-            # Extract month and last day
-            parts = date_str.split()
-            month_str = parts[0]
+    def _iter_result_rows(self, tournament, players, tournament_date):
+        """Yield one tournament_results_2026 row per player in the tournsum JSON"""
+        for player in players:
+            # Skip nameless rows before paying for any parsing
+            player_name = (player.get('name') or '').strip()
+            if not player_name:
+                continue
             
-            # Get end date
-            if '-' in date_str:
-                day_str = date_str.split('-')[1].split(',')[0].strip()
-            else:
-                day_str = parts[1].strip()
-            
-            # Month mapping
-            months = {
-                'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04',
-                'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
-                'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
-            }
-            
-            month = months.get(month_str, '01')
-            day = day_str.zfill(2)
-            
-            return f"2026-{month}-{day}"
-        except:
-            return "2026-01-01"
-    
-    def calculate_recent_form(self):
-        """Calculate recent form for all players"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get all players
-            cursor.execute("SELECT DISTINCT player_name FROM tournament_results_2026")
-            players = [row[0] for row in cursor.fetchall()]
-            
-            for player in players:
-                # Get last 5 tournaments
-                cursor.execute("""
-                    SELECT finish_position, sg_total, made_cut
-                    FROM tournament_results_2026
-                    WHERE player_name = ?
-                    ORDER BY tournament_date DESC
-                    LIMIT 5
-                """, (player,))
+            try:
+                # Position/finish
+                position = player.get('pos', '')
                 
-                recent_events = cursor.fetchall()
+                # Score
+                score_to_par = _to_int(player.get('tot'))
                 
-                if not recent_events:
-                    continue
+                # Rounds
+                rounds = player.get('rnds', [])
+                round1 = _to_int(rounds[0]) if len(rounds) > 0 else None
+                round2 = _to_int(rounds[1]) if len(rounds) > 1 else None
+                round3 = _to_int(rounds[2]) if len(rounds) > 2 else None
+                round4 = _to_int(rounds[3]) if len(rounds) > 3 else None
                 
-                events_played = len(recent_events)
-                cuts_made = sum(1 for e in recent_events if e[2] == 1)
+                # Total strokes
+                total_strokes = (round1 + round2 + round3 + round4) if round1 and round2 and round3 and round4 else None
                 
-                # Calculate stats
-                finishes = []
-                sg_totals = []
-                top_10s = 0
+                # Money
+                earnings = _to_float_money(player.get('money'))
                 
-                for finish, sg, made_cut in recent_events:
-                    if made_cut and finish and finish not in ['MC', 'WD', 'DQ']:
-                        try:
-                            finish_num = int(str(finish).replace('T', ''))
-                            finishes.append(finish_num)
-                            if finish_num <= 10:
-                                top_10s += 1
-                        except:
-                            pass
-                    
-                    if sg:
-                        sg_totals.append(float(sg))
+                # FedEx points
+                fedex_points = _to_float_money(player.get('pts'))
                 
-                avg_finish = sum(finishes) / len(finishes) if finishes else None
-                avg_sg = sum(sg_totals) / len(sg_totals) if sg_totals else None
-                best_finish = min(finishes) if finishes else None
+                # Made cut
+                made_cut = position not in ['MC', 'WD', 'DQ', 'CUT'] if position else False
+                
+            except Exception as e:
+                print(f"   Error importing {player_name}: {e}")
+                continue
+            
+            yield (player_name, tournament['name'], tournament['id'], position,
+                   score_to_par, total_strokes, round1, round2, round3, round4,
+                   earnings, fedex_points, made_cut, tournament_date)
+    
+    def _get_http_cache(self, url):
+        """Get (etag, last_modified, body_sha256) from the last successful fetch"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT etag, last_modified, body_sha256
+            FROM http_cache
+            WHERE url = ?
+        """, (url,))
+        return cursor.fetchone()
+    
+    def _save_http_cache(self, url, response, body_sha256):
+        """Remember response validators so the next run can send a conditional GET"""
+        self.conn.execute("""
+            INSERT OR REPLACE INTO http_cache
+            (url, etag, last_modified, body_sha256, fetched_at)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body_sha256))
+    
+    def _parse_date(self, date_str):
+        """Parse tournament date string to YYYY-MM-DD"""
+        # e.g., "Jan 2-5" -> "2026-01-05", "Jan 30 - Feb 2" -> "2026-02-02"
+        month, _, rest = date_str.partition(' ')
+        
+        # End date is whatever follows the last dash (may carry its own month)
+        end = rest.rpartition('-')[2].split(',')[0].split()
+        if len(end) > 1 and end[0] in _MONTHS:
+            month = end[0]
+        day_str = end[-1] if end else ''
+        
+        try:
+            day = int(day_str)
+        except ValueError:
+            return "2026-01-01"
+        
+        return f"2026-{_MONTHS.get(month, '01')}-{day:02d}"
+    
+    def calculate_recent_form(self):
+        """Calculate recent form for all players"""
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # One pass over all results, grouped by player, newest first
+        cursor.execute("""
+            SELECT player_name, finish_position, sg_total, made_cut
+            FROM tournament_results_2026
+            ORDER BY player_name, tournament_date DESC
+        """)
+        rows = cursor.fetchall()
+        
+        if rows:
+            names = np.array([r[0] for r in rows], dtype=object)
+            
+            # Group offsets, then keep each player's last 5 events
+            is_start = np.r_[True, names[1:] != names[:-1]]
+            starts = np.flatnonzero(is_start)
+            pos_in_group = np.arange(len(rows)) - starts[np.cumsum(is_start) - 1]
+            keep = pos_in_group < 5
+            
+            names = names[keep]
+            starts = np.flatnonzero(is_start[keep])
+            recent = [r for r, k in zip(rows, keep) if k]
+            
+            made_cut = np.array([r[3] == 1 for r in recent])
+            finishes = np.array([_finish_num(r[1]) if r[3] else np.nan for r in recent], dtype=float)
+            sg_totals = np.array([float(r[2]) if r[2] else np.nan for r in recent], dtype=float)
+            
+            has_finish = ~np.isnan(finishes)
+            has_sg = ~np.isnan(sg_totals)
+            
+            # Per-player aggregates
+            events_played = np.diff(np.r_[starts, len(names)])
+            cuts_made = np.add.reduceat(made_cut.astype(int), starts)
+            top_10s = np.add.reduceat((has_finish & (np.nan_to_num(finishes, nan=np.inf) <= 10)).astype(int), starts)
+            finish_count = np.add.reduceat(has_finish.astype(int), starts)
+            finish_sum = np.add.reduceat(np.where(has_finish, finishes, 0), starts)
+            best_finish = np.minimum.reduceat(np.where(has_finish, finishes, np.inf), starts)
+            sg_count = np.add.reduceat(has_sg.astype(int), starts)
+            sg_sum = np.add.reduceat(np.where(has_sg, sg_totals, 0), starts)
+            
+            now = _utc_timestamp()
+            form_rows = []
+            for i, player in enumerate(names[starts]):
+                avg_finish = float(finish_sum[i] / finish_count[i]) if finish_count[i] else None
+                avg_sg = float(sg_sum[i] / sg_count[i]) if sg_count[i] else None
+                best = str(int(best_finish[i])) if finish_count[i] else None
                 
                 # Form rating
                 form_rating = 'Unknown'
@@ -363,71 +518,58 @@ class PGATourAPIScraper:
                     else:
                         form_rating = '🔻 Poor'
                 
-                # Insert
-                cursor.execute("""
-                    INSERT OR REPLACE INTO player_recent_form
-                    (player_name, events_played, avg_finish, avg_sg_total,
-                     best_finish, cuts_made, top_10s, form_rating, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (player, events_played, avg_finish, avg_sg,
-                      str(best_finish) if best_finish else None, cuts_made, top_10s, form_rating))
+                form_rows.append((player, int(events_played[i]), avg_finish, avg_sg, best,
+                                  int(cuts_made[i]), int(top_10s[i]), form_rating, now))
             
-            conn.commit()
-            
-            cursor.execute("SELECT COUNT(*) FROM player_recent_form")
-            count = cursor.fetchone()[0]
-            print(f"✅ Updated form for {count} players")
+            cursor.executemany(_INSERT_FORM_SQL, form_rows)
+        
+        cursor.execute("SELECT COUNT(*) FROM player_recent_form")
+        count = cursor.fetchone()[0]
+        print(f"✅ Updated form for {count} players")
     
     def update_season_stats(self):
         """Update season totals from tournament results"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Aggregate season stats for each player
-            cursor.execute("""
-                SELECT 
-                    player_name,
-                    SUM(earnings) as total_money,
-                    SUM(fedex_points) as total_points,
-                    AVG(sg_total) as avg_sg_total
-                FROM tournament_results_2026
-                WHERE made_cut = 1
-                GROUP BY player_name
-            """)
-            
-            players = cursor.fetchall()
-            
-            for player_name, total_money, total_points, avg_sg in players:
-                # Calculate FedEx rank based on points
-                cursor.execute("""
-                    SELECT COUNT(*) + 1
-                    FROM (
-                        SELECT player_name, SUM(fedex_points) as pts
-                        FROM tournament_results_2026
-                        GROUP BY player_name
-                    )
-                    WHERE pts > ?
-                """, (total_points,))
-                
-                fedex_rank = cursor.fetchone()[0]
-                
-                # Update player_stats
-                cursor.execute("""
-                    INSERT OR REPLACE INTO player_stats
-                    (player_name, fedex_rank, season_money, sg_total, last_updated)
-                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (player_name, fedex_rank, total_money, avg_sg))
-                
-                # Update tournament_field
-                cursor.execute("""
-                    INSERT OR REPLACE INTO tournament_field
-                    (player_name, fedex_rank, last_updated)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (player_name, fedex_rank))
-            
-            conn.commit()
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # Aggregate season stats for each player
+        cursor.execute("""
+            SELECT 
+                player_name,
+                SUM(earnings) as total_money,
+                SUM(fedex_points) as total_points,
+                AVG(sg_total) as avg_sg_total
+            FROM tournament_results_2026
+            WHERE made_cut = 1
+            GROUP BY player_name
+        """)
+        
+        players = cursor.fetchall()
+        
+        # FedEx rank = 1 + number of players with more total points
+        cursor.execute("""
+            SELECT SUM(fedex_points)
+            FROM tournament_results_2026
+            GROUP BY player_name
+        """)
+        all_points = sorted(pts for (pts,) in cursor.fetchall() if pts is not None)
+        
+        now = _utc_timestamp()
+        stats_rows = []
+        field_rows = []
+        for player_name, total_money, total_points, avg_sg in players:
+            if total_points is None:
+                fedex_rank = 1
+            else:
+                fedex_rank = len(all_points) - bisect.bisect_right(all_points, total_points) + 1
             
-            print(f"✅ Updated season stats for {len(players)} players")
+            stats_rows.append((player_name, fedex_rank, total_money, avg_sg, now))
+            field_rows.append((player_name, fedex_rank, now))
+        
+        cursor.executemany(_INSERT_STATS_SQL, stats_rows)
+        cursor.executemany(_INSERT_FIELD_SQL, field_rows)
+        
+        print(f"✅ Updated season stats for {len(players)} players")
     
     def show_stats(self):
         """Show imported data statistics"""
@@ -435,49 +577,49 @@ class PGATourAPIScraper:
         print("📊 2026 SEASON DATA")
         print("="*60)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total results
-            cursor.execute("SELECT COUNT(*) FROM tournament_results_2026")
-            total = cursor.fetchone()[0]
-            print(f"Tournament results: {total}")
-            
-            # Tournaments
-            cursor.execute("SELECT COUNT(DISTINCT tournament_name) FROM tournament_results_2026")
-            tournaments = cursor.fetchone()[0]
-            print(f"Tournaments: {tournaments}")
-            
-            # Players
-            cursor.execute("SELECT COUNT(DISTINCT player_name) FROM tournament_results_2026")
-            players = cursor.fetchone()[0]
-            print(f"Players: {players}")
-            
-            # Top 10 FedEx Cup
-            print(f"\n🏆 Top 10 FedEx Cup Standings:")
-            cursor.execute("""
-                SELECT player_name, fedex_rank, season_money
-                FROM player_stats
-                WHERE fedex_rank IS NOT NULL
-                ORDER BY fedex_rank
-                LIMIT 10
-            """)
-            
-            for name, rank, money in cursor.fetchall():
-                print(f"   {rank}. {name} - ${money:,.0f}")
-            
-            # Recent form leaders
-            print(f"\n📈 Top Recent Form (by SG):")
-            cursor.execute("""
-                SELECT player_name, events_played, avg_sg_total, form_rating
-                FROM player_recent_form
-                WHERE avg_sg_total IS NOT NULL
-                ORDER BY avg_sg_total DESC
-                LIMIT 10
-            """)
-            
-            for name, events, avg_sg, rating in cursor.fetchall():
-                print(f"   {name}: +{avg_sg:.2f} SG ({events} events) {rating}")
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # Total results
+        cursor.execute("SELECT COUNT(*) FROM tournament_results_2026")
+        total = cursor.fetchone()[0]
+        print(f"Tournament results: {total}")
+        
+        # Tournaments
+        cursor.execute("SELECT COUNT(DISTINCT tournament_name) FROM tournament_results_2026")
+        tournaments = cursor.fetchone()[0]
+        print(f"Tournaments: {tournaments}")
+        
+        # Players
+        cursor.execute("SELECT COUNT(DISTINCT player_name) FROM tournament_results_2026")
+        players = cursor.fetchone()[0]
+        print(f"Players: {players}")
+        
+        # Top 10 FedEx Cup
+        print(f"\n🏆 Top 10 FedEx Cup Standings:")
+        cursor.execute("""
+            SELECT player_name, fedex_rank, season_money
+            FROM player_stats
+            WHERE fedex_rank IS NOT NULL
+            ORDER BY fedex_rank
+            LIMIT 10
+        """)
+        
+        for name, rank, money in cursor.fetchall():
+            print(f"   {rank}. {name} - ${money:,.0f}")
+        
+        # Recent form leaders
+        print(f"\n📈 Top Recent Form (by SG):")
+        cursor.execute("""
+            SELECT player_name, events_played, avg_sg_total, form_rating
+            FROM player_recent_form
+            WHERE avg_sg_total IS NOT NULL
+            ORDER BY avg_sg_total DESC
+            LIMIT 10
+        """)
+        
+        for name, events, avg_sg, rating in cursor.fetchall():
+            print(f"   {name}: +{avg_sg:.2f} SG ({events} events) {rating}")
         
         print("="*60)
 
@@ -494,11 +636,15 @@ def main():
     print("\n⚡ Starting tournament scraping...")
     print("This will take about 20-30 seconds\n")
     
-    results = scraper.scrape_all_2026_tournaments()
+    try:
+        results, unchanged = scraper.scrape_all_2026_tournaments()
+        
+        if results > 0:
+            scraper.show_stats()
+    finally:
+        scraper.close()
     
     if results > 0:
-        scraper.show_stats()
-        
         print("\n✅ SUCCESS! Your database now has:")
         print("  • Complete 2026 tournament results")
         print("  • FedEx Cup standings")
@@ -507,6 +653,9 @@ def main():
         
         print("\n📱 Restart your app to see the data:")
         print("  streamlit run app.py")
+    elif unchanged:
+        print(f"\n✅ Up to date - {unchanged} tournaments unchanged since last run")
+        print("  Nothing new to import")
     else:
         print("\n⚠️  No tournaments scraped.")
         print("  This could mean:")
@@ -9,18 +9,17 @@ import subprocess
 import sys
 import webbrowser
 import time
+import importlib.util
 from pathlib import Path
 
 def check_dependencies():
     """Check if dependencies are installed"""
-    try:
-        import streamlit
-        import pandas
-        import requests
-        from bs4 import BeautifulSoup
-        return True
-    except ImportError:
-        return False
+    # find_spec only locates the packages - importing streamlit here would
+    # cost over a second just before it is launched in a subprocess anyway
+    return all(
+        importlib.util.find_spec(module) is not None
+        for module in ('streamlit', 'pandas', 'requests', 'bs4')
+    )
 
 def main():
     print("=" * 60)
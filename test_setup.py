@@ -4,40 +4,28 @@ Test script to verify PGA Fantasy Tracker installation
 Run this after setup to ensure everything is working properly
 """
 
+import os
 import sys
-from pathlib import Path
+import importlib.util
 
 def test_imports():
     """Test that all required modules can be imported"""
     print("🧪 Testing imports...")
     
-    try:
-        import streamlit
-        print("  ✅ streamlit")
-    except ImportError:
-        print("  ❌ streamlit - Run: pip install streamlit")
-        return False
-    
-    try:
-        import pandas
-        print("  ✅ pandas")
-    except ImportError:
-        print("  ❌ pandas - Run: pip install pandas")
-        return False
-    
-    try:
-        import requests
-        print("  ✅ requests")
-    except ImportError:
-        print("  ❌ requests - Run: pip install requests")
-        return False
+    # find_spec only locates each package - importing streamlit and pandas
+    # just to prove they are installed costs seconds of module start-up
+    required = [
+        ('streamlit', 'streamlit'),
+        ('pandas', 'pandas'),
+        ('requests', 'requests'),
+        ('bs4', 'beautifulsoup4'),
+    ]
     
-    try:
-        from bs4 import BeautifulSoup
-        print("  ✅ beautifulsoup4")
-    except ImportError:
-        print("  ❌ beautifulsoup4 - Run: pip install beautifulsoup4")
-        return False
+    for module, package in required:
+        if importlib.util.find_spec(module) is None:
+            print(f"  ❌ {package} - Run: pip install {package}")
+            return False
+        print(f"  ✅ {package}")
     
     return True
 
@@ -158,9 +146,18 @@ def test_file_structure():
         'utils/predictor.py'
     ]
     
+    # One directory listing per folder instead of a stat() per file
+    listings = {}
+    for folder in {os.path.dirname(file) or '.' for file in required_files}:
+        try:
+            listings[folder] = {entry.name for entry in os.scandir(folder)}
+        except OSError:
+            listings[folder] = set()
+    
     all_exist = True
     for file in required_files:
-        if Path(file).exists():
+        folder, name = os.path.split(file)
+        if name in listings[folder or '.']:
             print(f"  ✅ {file}")
         else:
             print(f"  ❌ {file} - Missing!")
@@ -10,13 +10,22 @@ Run weekly to update with latest tournaments
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import pandas as pd
+import numpy as np
 import sqlite3
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+from utils.database import tune_connection, checkpoint_wal
+
+# Tournaments fetched at once - kept small to respect the PGA servers
+MAX_CONCURRENT_FETCHES = 4
+
 class Tournament2026Tracker:
     """Track all 2026 PGA Tour tournaments"""
     
@@ -25,8 +34,21 @@ class Tournament2026Tracker:
         self.base_url = "https://www.pgatour.com"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Connection': 'keep-alive'
         })
+        # Reuse TLS connections to pgatour.com and retry transient failures
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=16,
+            max_retries=Retry(total=5, backoff_factor=0.5,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # One connection for the whole run - opened once, committed once
+        self.conn = self._connect()
         self.init_tables()
         
         # 2026 Tournament Schedule (update as season progresses)
@@ -75,55 +97,77 @@ class Tournament2026Tracker:
             }
         ]
     
+    def _connect(self):
+        """Open the long-lived database connection, tuned for bulk ingest"""
+        # WAL lets the app keep reading while the tracker writes
+        return tune_connection(sqlite3.connect(self.db_path), writer=True, cache_kib=65536)
+    
+    def close(self):
+        """Checkpoint the WAL into the database file and close the connection"""
+        checkpoint_wal(self.conn, "TRUNCATE")
+        self.conn.close()
+    
     def init_tables(self):
         """Initialize 2026 tournament tracking tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # 2026 tournament results (player + tournament + detailed stats)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tournament_results_2026 (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name TEXT NOT NULL,
-                    tournament_name TEXT NOT NULL,
-                    tournament_id TEXT,
-                    finish_position TEXT,
-                    score_to_par INTEGER,
-                    total_strokes INTEGER,
-                    round1 INTEGER,
-                    round2 INTEGER,
-                    round3 INTEGER,
-                    round4 INTEGER,
-                    earnings REAL,
-                    fedex_points REAL,
-                    sg_total REAL,
-                    sg_ott REAL,
-                    sg_app REAL,
-                    sg_arg REAL,
-                    sg_putt REAL,
-                    made_cut BOOLEAN,
-                    tournament_date DATE,
-                    UNIQUE(player_name, tournament_name)
-                )
-            """)
-            
-            # Player recent form summary (calculated from last 3-5 events)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS player_recent_form (
-                    player_name TEXT PRIMARY KEY,
-                    events_played INTEGER,
-                    avg_finish REAL,
-                    avg_sg_total REAL,
-                    best_finish TEXT,
-                    cuts_made INTEGER,
-                    top_10s INTEGER,
-                    form_rating TEXT,
-                    last_updated TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            print("✅ 2026 tournament tables initialized")
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # 2026 tournament results (player + tournament + detailed stats)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tournament_results_2026 (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_name TEXT NOT NULL,
+                tournament_name TEXT NOT NULL,
+                tournament_id TEXT,
+                finish_position TEXT,
+                score_to_par INTEGER,
+                total_strokes INTEGER,
+                round1 INTEGER,
+                round2 INTEGER,
+                round3 INTEGER,
+                round4 INTEGER,
+                earnings REAL,
+                fedex_points REAL,
+                sg_total REAL,
+                sg_ott REAL,
+                sg_app REAL,
+                sg_arg REAL,
+                sg_putt REAL,
+                made_cut BOOLEAN,
+                tournament_date DATE,
+                UNIQUE(player_name, tournament_name)
+            )
+        """)
+        
+        # Recent-form lookups walk each player's results newest first
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_results_player_date
+            ON tournament_results_2026(player_name, tournament_date DESC)
+        """)
+        
+        # Latest tournament date (weekly_check.py) comes from the index
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trr_date
+            ON tournament_results_2026(tournament_date DESC)
+        """)
+        
+        # Player recent form summary (calculated from last 3-5 events)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS player_recent_form (
+                player_name TEXT PRIMARY KEY,
+                events_played INTEGER,
+                avg_finish REAL,
+                avg_sg_total REAL,
+                best_finish TEXT,
+                cuts_made INTEGER,
+                top_10s INTEGER,
+                form_rating TEXT,
+                last_updated TIMESTAMP
+            )
+        """)
+        
+        conn.commit()
+        print("✅ 2026 tournament tables initialized")
     
     def scrape_all_tournaments(self):
         """Scrape all completed 2026 tournaments"""
@@ -139,12 +183,20 @@ class Tournament2026Tracker:
         
         total_results = 0
         
-        for tournament in completed:
+        # Fetch every tournament concurrently, then write them one by one
+        # so SQLite only ever sees a single writer
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as pool:
+            fetched = list(pool.map(self._fetch_tournament_results, completed))
+        
+        for tournament, rows in zip(completed, fetched):
             print(f"\n{'='*60}")
             print(f"📥 Scraping: {tournament['name']}")
             print(f"{'='*60}")
+            print(f"   Tournament: {tournament['name']}")
+            print(f"   Course: {tournament['course']}")
+            print(f"   Dates: {tournament['dates']}")
             
-            results = self.scrape_tournament_results(tournament)
+            results = self._save_tournament_results(rows)
             if results > 0:
                 total_results += results
                 print(f"✅ Imported {results} player results")
@@ -157,7 +209,8 @@ class Tournament2026Tracker:
         print(f"✅ COMPLETE: {total_results} total player results imported")
         print(f"{'='*60}")
         
-        # Calculate recent form for all players
+        # Calculate recent form for all players - its commit also covers
+        # every tournament saved above, so the whole ingest is one transaction
         print(f"\n📊 Calculating recent form...")
         self.calculate_recent_form()
         
@@ -165,6 +218,16 @@ class Tournament2026Tracker:
     
     def scrape_tournament_results(self, tournament):
         """Scrape results for a single tournament"""
+        print(f"   Tournament: {tournament['name']}")
+        print(f"   Course: {tournament['course']}")
+        print(f"   Dates: {tournament['dates']}")
+        
+        imported = self._save_tournament_results(self._fetch_tournament_results(tournament))
+        self.conn.commit()
+        return imported
+    
+    def _fetch_tournament_results(self, tournament):
+        """Fetch one tournament's leaderboard as rows ready for insert (thread-safe)"""
         try:
             # Try official PGA Tour results page
             # URL format: https://www.pgatour.com/tournaments/[tournament-name]/[year]/R[tournament-id]
@@ -172,49 +235,55 @@ class Tournament2026Tracker:
             # For now, use a simpler approach - scrape from stats pages
             # This is a placeholder - real implementation would parse tournament pages
             
-            print(f"   Tournament: {tournament['name']}")
-            print(f"   Course: {tournament['course']}")
-            print(f"   Dates: {tournament['dates']}")
-            
             # TEMPORARY: Create sample data structure
             # In production, this would actually scrape PGA Tour
             
             sample_results = self._get_sample_tournament_data(tournament)
             
-            # Import to database
-            imported = 0
-            with sqlite3.connect(self.db_path) as conn:
-                for result in sample_results:
-                    try:
-                        conn.execute("""
-                            INSERT OR REPLACE INTO tournament_results_2026
-                            (player_name, tournament_name, tournament_id, finish_position,
-                             score_to_par, earnings, fedex_points, sg_total, made_cut, tournament_date)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            result['player_name'],
-                            tournament['name'],
-                            tournament['id'],
-                            result['finish'],
-                            result['score_to_par'],
-                            result['earnings'],
-                            result['fedex_points'],
-                            result['sg_total'],
-                            result['made_cut'],
-                            result['date']
-                        ))
-                        imported += 1
-                    except Exception as e:
-                        print(f"   Error importing {result.get('player_name')}: {e}")
-                        continue
-                
-                conn.commit()
+            # to_records().tolist() yields plain Python values sqlite3 can bind
+            return sample_results.assign(
+                tournament_name=tournament['name'],
+                tournament_id=tournament['id']
+            )[[
+                'player_name', 'tournament_name', 'tournament_id', 'finish',
+                'score_to_par', 'earnings', 'fedex_points', 'sg_total',
+                'made_cut', 'date'
+            ]].to_records(index=False).tolist()
             
-            return imported
+        except Exception as e:
+            print(f"   Error scraping {tournament['name']}: {e}")
+            return []
+    
+    def _save_tournament_results(self, rows):
+        """Import fetched rows with one executemany (the caller commits)
+        
+        The insert runs inside a savepoint, so a row failing mid-batch
+        discards this tournament's rows without touching the other
+        tournaments still waiting for the caller's commit.
+        """
+        if not rows:
+            return 0
+        
+        conn = self.conn
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute("SAVEPOINT save_tournament")
+        try:
+            conn.executemany("""
+                INSERT OR REPLACE INTO tournament_results_2026
+                (player_name, tournament_name, tournament_id, finish_position,
+                 score_to_par, earnings, fedex_points, sg_total, made_cut, tournament_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
             
         except Exception as e:
-            print(f"   Error scraping tournament: {e}")
+            conn.execute("ROLLBACK TO save_tournament")
+            conn.execute("RELEASE save_tournament")
+            print(f"   Error saving tournament: {e}")
             return 0
+        
+        conn.execute("RELEASE save_tournament")
+        return len(rows)
     
     def _get_sample_tournament_data(self, tournament):
         """Generate sample tournament data (TEMPORARY - replace with real scraper)"""
@@ -231,117 +300,82 @@ class Tournament2026Tracker:
             'Rickie Fowler', 'Adam Scott', 'Justin Rose', 'Sahith Theegala'
         ]
         
-        results = []
-        for idx, player in enumerate(sample_players, 1):
-            # Generate realistic tournament results
-            made_cut = idx <= 70
-            
-            if made_cut:
-                finish = idx
-                score_to_par = -15 + (idx - 1)  # Winner at -15, decreasing
-                earnings = max(0, 1500000 - (idx * 15000))
-                fedex_points = max(0, 500 - (idx * 5))
-                sg_total = 2.5 - (idx * 0.05)  # Better players = higher SG
-            else:
-                finish = 'MC'
-                score_to_par = 2
-                earnings = 0
-                fedex_points = 0
-                sg_total = -1.0
-            
-            results.append({
-                'player_name': player,
-                'finish': str(finish) if finish != 'MC' else 'MC',
-                'score_to_par': score_to_par,
-                'earnings': earnings,
-                'fedex_points': fedex_points,
-                'sg_total': sg_total,
-                'made_cut': made_cut,
-                'date': '2026-01-26'  # Date of tournament
-            })
-        
-        return results
+        # Generate realistic tournament results for the whole field at once
+        idx = np.arange(1, len(sample_players) + 1)
+        made_cut = idx <= 70
+        
+        return pd.DataFrame({
+            'player_name': sample_players,
+            'finish': np.where(made_cut, idx.astype(str), 'MC'),
+            'score_to_par': np.where(made_cut, -15 + (idx - 1), 2),  # Winner at -15, decreasing
+            'earnings': np.where(made_cut, np.maximum(0, 1500000 - idx * 15000), 0),
+            'fedex_points': np.where(made_cut, np.maximum(0, 500 - idx * 5), 0),
+            'sg_total': np.where(made_cut, 2.5 - idx * 0.05, -1.0),  # Better players = higher SG
+            'made_cut': made_cut,
+            'date': '2026-01-26'  # Date of tournament
+        })
     
     def calculate_recent_form(self):
         """Calculate recent form for all players based on last 3-5 events"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Get all players who played in 2026
-            cursor.execute("""
-                SELECT DISTINCT player_name
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # Aggregate each player's last 5 events entirely inside SQLite.
+        # A finish counts only for made cuts with a numeric position ('T5' -> 5).
+        cursor.execute("""
+            WITH ranked AS (
+                SELECT player_name, finish_position, sg_total, made_cut,
+                       REPLACE(finish_position, 'T', '') AS finish_digits,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY player_name
+                           ORDER BY tournament_date DESC
+                       ) AS rn
                 FROM tournament_results_2026
-            """)
-            
-            players = [row[0] for row in cursor.fetchall()]
-            
-            for player in players:
-                # Get last 5 tournaments for this player
-                cursor.execute("""
-                    SELECT finish_position, sg_total, made_cut
-                    FROM tournament_results_2026
-                    WHERE player_name = ?
-                    ORDER BY tournament_date DESC
-                    LIMIT 5
-                """, (player,))
-                
-                recent_events = cursor.fetchall()
-                
-                if not recent_events:
-                    continue
-                
-                events_played = len(recent_events)
-                cuts_made = sum(1 for e in recent_events if e[2] == 1)
-                
-                # Calculate average finish (only for made cuts)
-                finishes = []
-                sg_totals = []
-                top_10s = 0
-                
-                for finish, sg, made_cut in recent_events:
-                    if made_cut and finish and finish != 'MC':
-                        try:
-                            finish_num = int(str(finish).replace('T', ''))
-                            finishes.append(finish_num)
-                            if finish_num <= 10:
-                                top_10s += 1
-                        except:
-                            pass
-                    
-                    if sg:
-                        sg_totals.append(float(sg))
-                
-                avg_finish = sum(finishes) / len(finishes) if finishes else None
-                avg_sg = sum(sg_totals) / len(sg_totals) if sg_totals else None
-                best_finish = min(finishes) if finishes else None
-                
-                # Determine form rating
-                form_rating = 'Unknown'
-                if avg_sg:
-                    if avg_sg >= 1.5:
-                        form_rating = '🔥 Excellent'
-                    elif avg_sg >= 0.5:
-                        form_rating = '✅ Good'
-                    elif avg_sg >= -0.5:
-                        form_rating = '🔶 Average'
-                    else:
-                        form_rating = '🔻 Poor'
-                
-                # Insert form summary
-                cursor.execute("""
-                    INSERT OR REPLACE INTO player_recent_form
-                    (player_name, events_played, avg_finish, avg_sg_total,
-                     best_finish, cuts_made, top_10s, form_rating, last_updated)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                """, (player, events_played, avg_finish, avg_sg,
-                      str(best_finish) if best_finish else None, cuts_made, top_10s, form_rating))
-            
-            conn.commit()
-            
-            # Show summary
-            cursor.execute("SELECT COUNT(*) FROM player_recent_form")
-            count = cursor.fetchone()[0]
-            print(f"✅ Calculated recent form for {count} players")
+            ),
+            recent AS (
+                SELECT player_name, made_cut,
+                       CASE WHEN sg_total != 0 THEN sg_total END AS sg,
+                       CASE WHEN made_cut AND finish_position != 'MC'
+                             AND finish_digits != ''
+                             AND finish_digits NOT GLOB '*[^0-9]*'
+                            THEN CAST(finish_digits AS INTEGER)
+                       END AS finish_num
+                FROM ranked
+                WHERE rn <= 5
+            ),
+            summary AS (
+                SELECT player_name,
+                       COUNT(*) AS events_played,
+                       AVG(finish_num) AS avg_finish,
+                       AVG(sg) AS avg_sg,
+                       MIN(finish_num) AS best_finish,
+                       SUM(CASE WHEN made_cut = 1 THEN 1 ELSE 0 END) AS cuts_made,
+                       SUM(CASE WHEN finish_num <= 10 THEN 1 ELSE 0 END) AS top_10s
+                FROM recent
+                GROUP BY player_name
+            )
+            INSERT OR REPLACE INTO player_recent_form
+            (player_name, events_played, avg_finish, avg_sg_total,
+             best_finish, cuts_made, top_10s, form_rating, last_updated)
+            SELECT player_name, events_played, avg_finish, avg_sg,
+                   CAST(NULLIF(best_finish, 0) AS TEXT), cuts_made, top_10s,
+                   CASE
+                       WHEN avg_sg IS NULL OR avg_sg = 0 THEN 'Unknown'
+                       WHEN avg_sg >= 1.5 THEN '🔥 Excellent'
+                       WHEN avg_sg >= 0.5 THEN '✅ Good'
+                       WHEN avg_sg >= -0.5 THEN '🔶 Average'
+                       ELSE '🔻 Poor'
+                   END,
+                   CURRENT_TIMESTAMP
+            FROM summary
+        """)
+        
+        conn.commit()
+        
+        # Show summary
+        cursor.execute("SELECT COUNT(*) FROM player_recent_form")
+        count = cursor.fetchone()[0]
+        print(f"✅ Calculated recent form for {count} players")
     
     def show_stats(self):
         """Show 2026 tournament statistics"""
@@ -349,35 +383,35 @@ class Tournament2026Tracker:
         print("📊 2026 SEASON STATISTICS")
         print("="*60)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Total results
-            cursor.execute("SELECT COUNT(*) FROM tournament_results_2026")
-            total = cursor.fetchone()[0]
-            print(f"Total tournament results: {total}")
-            
-            # Unique tournaments
-            cursor.execute("SELECT COUNT(DISTINCT tournament_name) FROM tournament_results_2026")
-            tournaments = cursor.fetchone()[0]
-            print(f"Tournaments tracked: {tournaments}")
-            
-            # Unique players
-            cursor.execute("SELECT COUNT(DISTINCT player_name) FROM tournament_results_2026")
-            players = cursor.fetchone()[0]
-            print(f"Players with results: {players}")
-            
-            print(f"\n📈 Recent Form Leaders:")
-            cursor.execute("""
-                SELECT player_name, events_played, avg_sg_total, form_rating
-                FROM player_recent_form
-                WHERE avg_sg_total IS NOT NULL
-                ORDER BY avg_sg_total DESC
-                LIMIT 10
-            """)
-            
-            for name, events, avg_sg, rating in cursor.fetchall():
-                print(f"   {name}: {avg_sg:.2f} SG ({events} events) - {rating}")
+        conn = self.conn
+        cursor = conn.cursor()
+        
+        # Total results
+        cursor.execute("SELECT COUNT(*) FROM tournament_results_2026")
+        total = cursor.fetchone()[0]
+        print(f"Total tournament results: {total}")
+        
+        # Unique tournaments
+        cursor.execute("SELECT COUNT(DISTINCT tournament_name) FROM tournament_results_2026")
+        tournaments = cursor.fetchone()[0]
+        print(f"Tournaments tracked: {tournaments}")
+        
+        # Unique players
+        cursor.execute("SELECT COUNT(DISTINCT player_name) FROM tournament_results_2026")
+        players = cursor.fetchone()[0]
+        print(f"Players with results: {players}")
+        
+        print(f"\n📈 Recent Form Leaders:")
+        cursor.execute("""
+            SELECT player_name, events_played, avg_sg_total, form_rating
+            FROM player_recent_form
+            WHERE avg_sg_total IS NOT NULL
+            ORDER BY avg_sg_total DESC
+            LIMIT 10
+        """)
+        
+        for name, events, avg_sg, rating in cursor.fetchall():
+            print(f"   {name}: {avg_sg:.2f} SG ({events} events) - {rating}")
         
         print("="*60)
 
@@ -399,17 +433,20 @@ def main():
     
     response = input().strip().lower()
     
-    if response == 'y':
-        results = tracker.scrape_all_tournaments()
-        tracker.show_stats()
-        
-        print("\n✅ Done! Your database now has:")
-        print("  • 2026 tournament results")
-        print("  • Recent form for each player")
-        print("\n📱 Restart your app to see the data:")
-        print("  streamlit run app.py")
-    else:
-        print("\n❌ Cancelled")
+    try:
+        if response == 'y':
+            results = tracker.scrape_all_tournaments()
+            tracker.show_stats()
+            
+            print("\n✅ Done! Your database now has:")
+            print("  • 2026 tournament results")
+            print("  • Recent form for each player")
+            print("\n📱 Restart your app to see the data:")
+            print("  streamlit run app.py")
+        else:
+            print("\n❌ Cancelled")
+    finally:
+        tracker.close()
 
 if __name__ == "__main__":
     main()
@@ -10,7 +10,12 @@ Usage:
 import sqlite3
 import os
 import sys
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from collections import Counter
+from itertools import chain, islice
 from pathlib import Path
 
 TURSO_URL = "https://pga-fantasy-plantationcane.aws-us-east-1.turso.io"
@@ -30,6 +35,44 @@ HISTORICAL_TABLES = [
     'course_history',
 ]
 
+# SQLite's default bound-parameter limit - caps rows per multi-row INSERT
+MAX_PARAMS_PER_STATEMENT = 999
+
+# Pipeline POSTs allowed in flight at once (across all tables)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Batches each table keeps queued or in flight - bounds memory while streaming
+MAX_PENDING_BATCHES = MAX_CONCURRENT_REQUESTS * 2
+
+# Retries for HTTP 429 (rate limited), with exponential back-off
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Shared arg for every NULL cell - never mutated, only serialized
+NULL_ARG = {"type": "null"}
+
+
+def _int_arg(p):
+    return {"type": "integer", "value": str(int(p))}
+
+
+def _float_arg(p):
+    return {"type": "float", "value": p}
+
+
+def _text_arg(p):
+    return {"type": "text", "value": str(p)}
+
+
+# Exact-type lookup for the values sqlite3 returns - one dict hit per cell
+# instead of a chain of isinstance checks
+ARG_ENCODERS = {
+    type(None): lambda p: NULL_ARG,
+    bool: _int_arg,
+    int: _int_arg,
+    float: _float_arg,
+    str: _text_arg,
+}
+
 
 class TursoUploader:
     def __init__(self, url, token):
@@ -39,40 +82,67 @@ class TursoUploader:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json"
         })
+        # One pooled connection per concurrent upload worker
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS)
+        self.session.mount("https://", adapter)
     
     def _make_arg(self, p):
         """Convert a Python value to Turso API arg format"""
         if p is None:
-            return {"type": "null"}
-        elif isinstance(p, bool):
-            return {"type": "integer", "value": str(int(p))}
-        elif isinstance(p, int):
-            return {"type": "integer", "value": str(p)}
+            return NULL_ARG
+        elif isinstance(p, (bool, int)):
+            return _int_arg(p)
         elif isinstance(p, float):
-            return {"type": "float", "value": p}
+            return _float_arg(p)
         else:
-            return {"type": "text", "value": str(p)}
+            return _text_arg(p)
     
     def execute_batch(self, statements):
+        encoder_for = ARG_ENCODERS.get
+        make_arg = self._make_arg
+        
+        # SQL repeated within this pipeline (the full-size multi-row INSERT)
+        # is stored once and then referenced by id. Stored SQL only lives as
+        # long as the pipeline's stream, so ids are numbered per request.
+        repeated = {sql for sql, n in Counter(sql for sql, _ in statements).items() if n > 1}
+        sql_ids = {}
+        
         requests_list = []
         for sql, params in statements:
-            args = [self._make_arg(p) for p in params] if params else []
-            stmt = {"type": "execute", "stmt": {"sql": sql}}
+            # Subclasses and other types fall back to the isinstance checks
+            args = [(encoder_for(type(p)) or make_arg)(p) for p in params] if params else []
+            if sql in repeated:
+                if sql not in sql_ids:
+                    sql_ids[sql] = len(sql_ids) + 1
+                    requests_list.append({"type": "store_sql", "sql_id": sql_ids[sql], "sql": sql})
+                stmt = {"type": "execute", "stmt": {"sql_id": sql_ids[sql]}}
+            else:
+                stmt = {"type": "execute", "stmt": {"sql": sql}}
             if args:
                 stmt["stmt"]["args"] = args
             requests_list.append(stmt)
         
         body = {"requests": requests_list}
-        resp = self.session.post(f"{self.url}/v2/pipeline", json=body, timeout=120)
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            resp = self.session.post(f"{self.url}/v2/pipeline", json=body, timeout=120)
+            if resp.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                break
+            time.sleep(0.5 * 2 ** attempt)
         
         if resp.status_code != 200:
             raise Exception(f"HTTP {resp.status_code}: {resp.text[:300]}")
         
         data = resp.json()
-        # Check for individual statement errors
-        for i, result in enumerate(data.get("results", [])):
+        # Check for individual statement errors - results line up with
+        # requests_list, so skip the store_sql entries when numbering
+        statement = 0
+        for request, result in zip(requests_list, data.get("results", [])):
             if "error" in result:
-                raise Exception(f"Statement {i} error: {result['error']}")
+                if request["type"] == "store_sql":
+                    raise Exception(f"Stored SQL {request['sql_id']} error: {result['error']}")
+                raise Exception(f"Statement {statement} error: {result['error']}")
+            if request["type"] == "execute":
+                statement += 1
         
         return data
     
@@ -85,70 +155,138 @@ def get_local_db():
     if not db_path.exists():
         print(f"Error: not found: {db_path}")
         sys.exit(1)
-    return sqlite3.connect(str(db_path))
+    # Table workers read concurrently through their own cursors
+    return sqlite3.connect(str(db_path), check_same_thread=False)
+
+
+def insert_statements(table_name, placeholders, rows_per_statement, batch):
+    """Split a batch of rows into multi-row INSERT statements"""
+    statements = []
+    for j in range(0, len(batch), rows_per_statement):
+        chunk = batch[j:j + rows_per_statement]
+        multi_sql = f"INSERT INTO {table_name} VALUES " + ','.join([f"({placeholders})"] * len(chunk))
+        statements.append((multi_sql, list(chain.from_iterable(chunk))))
+    return statements
+
+
+def upload_batch(turso, table_name, insert_sql, placeholders, rows_per_statement, batch):
+    """Upload one batch of rows, returns (inserted, errors)"""
+    statements = insert_statements(table_name, placeholders, rows_per_statement, batch)
+    
+    try:
+        turso.execute_batch(statements)
+        return len(batch), 0
+    except Exception as e:
+        # Retry one at a time
+        inserted = 0
+        errors = 0
+        for row in batch:
+            try:
+                turso.execute(insert_sql, list(row))
+                inserted += 1
+            except Exception as e2:
+                errors += 1
+        return inserted, errors
+
+
+def setup_table(turso, table_name, schema, indexes, insert_sql, placeholders, rows_per_statement,
+                first_batch):
+    """Empty (or recreate) the Turso table and upload the first batch, returns (inserted, errors)"""
+    # Empty the Turso table rather than dropping it, so an unchanged schema
+    # is never rebuilt. The remote schema is read back in the same pipeline
+    # POST as the first batch, so all of this costs a single round trip.
+    try:
+        data = turso.execute_batch(
+            [("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", [table_name]),
+             (schema.replace("CREATE TABLE ", "CREATE TABLE IF NOT EXISTS ", 1), None)]
+            + [(f"DROP INDEX IF EXISTS {name}", None) for name, _ in indexes]
+            + [(f"DELETE FROM {table_name}", None)]
+            + insert_statements(table_name, placeholders, rows_per_statement, first_batch)
+        )
+        remote = data["results"][0]["response"]["result"]["rows"]
+        if remote and remote[0][0].get("value") != schema:
+            raise Exception("schema changed")
+        return len(first_batch), 0
+    except Exception as e:
+        # Schema changed or the pipeline failed - drop and recreate the table
+        # step by step, which also discards any partial insert
+        try:
+            turso.execute(f"DROP TABLE IF EXISTS {table_name}")
+        except:
+            pass
+        turso.execute(schema)
+        return upload_batch(turso, table_name, insert_sql, placeholders, rows_per_statement, first_batch)
 
 
-def sync_table(local_conn, turso, table_name):
+def sync_table(local_conn, turso, table_name, request_pool):
     cursor = local_conn.cursor()
     
-    cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-    if cursor.fetchone()[0] == 0:
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+    found = cursor.fetchone()
+    if found is None:
         print(f"   Skipping '{table_name}' (not found)")
         return 0
+    schema = found[0]
+    
+    # Secondary indexes are built once after the load rather than being
+    # updated row by row (auto-indexes from UNIQUE/PRIMARY KEY have no sql)
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                   (table_name,))
+    indexes = cursor.fetchall()
+    
+    batch_size = 200
     
-    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-    local_count = cursor.fetchone()[0]
-    if local_count == 0:
+    # Stream the data - only a few batches are held in memory at a time
+    cursor.execute(f"SELECT * FROM {table_name}")
+    num_cols = len(cursor.description)
+    rows = iter(cursor)
+    first_batch = list(islice(rows, batch_size))
+    if not first_batch:
         print(f"   Skipping '{table_name}' (empty)")
         return 0
     
-    print(f"   {table_name}: {local_count} rows...", flush=True)
+    print(f"   {table_name}: uploading...", flush=True)
     
-    # Create table in Turso (drop and recreate for clean sync)
-    cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-    schema = cursor.fetchone()[0]
+    placeholders = ','.join(['?' for _ in range(num_cols)])
+    insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders})"
     
-    try:
-        turso.execute(f"DROP TABLE IF EXISTS {table_name}")
-    except:
-        pass
-    turso.execute(schema)
+    # Pack as many rows into each INSERT as the parameter limit allows
+    rows_per_statement = max(1, MAX_PARAMS_PER_STATEMENT // num_cols)
     
-    # Get data
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
+    # Every POST goes through request_pool, which caps the POSTs in flight
+    # (and so the pooled connections) at MAX_CONCURRENT_REQUESTS
+    inserted, errors = request_pool.submit(
+        setup_table, turso, table_name, schema, indexes, insert_sql, placeholders,
+        rows_per_statement, first_batch
+    ).result()
     
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    num_cols = len(cursor.fetchall())
-    placeholders = ','.join(['?' for _ in range(num_cols)])
-    insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders})"
+    # Upload the rest in batches - the shared pool keeps several POSTs in flight
+    pending = set()
+    for batch in iter(lambda: list(islice(rows, batch_size)), []):
+        if len(pending) >= MAX_PENDING_BATCHES:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_inserted, batch_errors = future.result()
+                inserted += batch_inserted
+                errors += batch_errors
+        pending.add(request_pool.submit(upload_batch, turso, table_name, insert_sql,
+                                        placeholders, rows_per_statement, batch))
     
-    # Upload in batches
-    batch_size = 200
-    inserted = 0
-    errors = 0
+    for future in wait(pending).done:
+        batch_inserted, batch_errors = future.result()
+        inserted += batch_inserted
+        errors += batch_errors
     
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
-        statements = [(insert_sql, list(row)) for row in batch]
-        
+    if indexes:
         try:
-            turso.execute_batch(statements)
-            inserted += len(batch)
+            request_pool.submit(
+                turso.execute_batch, [(index_sql, None) for _, index_sql in indexes]
+            ).result()
         except Exception as e:
-            # Retry one at a time
-            for sql, params in statements:
-                try:
-                    turso.execute(sql, params)
-                    inserted += 1
-                except Exception as e2:
-                    errors += 1
-        
-        pct = min(100, int((i + batch_size) / len(rows) * 100))
-        print(f"\r   {table_name}: {pct}% ({inserted}/{local_count})", end="", flush=True)
+            print(f"   {table_name}: index rebuild failed - {e}")
     
     suffix = f" ({errors} errors)" if errors else ""
-    print(f"\r   {table_name}: done - {inserted} rows{suffix}          ")
+    print(f"   {table_name}: done - {inserted} rows{suffix}")
     return inserted
 
 
@@ -179,9 +317,16 @@ def main():
     
     tables = WEEKLY_TABLES + (HISTORICAL_TABLES if include_historical else [])
     
-    total = 0
-    for table in tables:
-        total += sync_table(local_conn, turso, table)
+    # Tables are independent, so they upload side by side; request_pool
+    # runs every pipeline POST, capping those in flight across all of them
+    # (table_pool threads only read the local database and wait)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as request_pool, \
+            ThreadPoolExecutor(max_workers=len(tables)) as table_pool:
+        futures = [
+            table_pool.submit(sync_table, local_conn, turso, table, request_pool)
+            for table in tables
+        ]
+        total = sum(future.result() for future in futures)
     
     print(f"\n{'=' * 60}")
     print(f"Done! {total} rows uploaded")
@@ -1,36 +1,235 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import sqlite3
 import json
+import difflib
+import threading
 import time
 
+from utils.database import tune_connection
+
+# Finish codes for events a player didn't complete - scored as 70th
+_NON_FINISHES = ('CUT', 'MC', 'MDF', 'WD', 'DQ', 'DNS', 'NONE', 'NAN')
+
+# Cache lifetimes, compared against time.monotonic() timestamps
+_CACHE_TTL_SECONDS = 24 * 3600
+_TOURNEY_CACHE_TTL_SECONDS = 30 * 60
+
+
+def _match_score(target, tournament_name):
+    """How closely a stored tournament name matches the target (0-1)"""
+    return difflib.SequenceMatcher(None, target.lower(), str(tournament_name).lower()).ratio()
 
 
 class PGADataFetcher:
     """Fetches data from PGA Tour and database"""
     
+    # get_player_stats results kept per (player, tournament), least recently used evicted first
+    PLAYER_CACHE_SIZE = 512
+    
+    # Database files this process has already indexed and optimized, so
+    # the fetcher built on every rerun skips that DDL when it connects
+    _migrated = set()
+    
+    # SQL used on every lookup, kept as fixed text so the connection's
+    # statement cache reuses the prepared statements across the field
+    _SQL_PLAYER_STATS = "SELECT player_name, fedex_rank, season_money, sg_total FROM player_stats"
+    _SQL_RECENT_FORM = """
+        SELECT player_name, form_rating, events_played, avg_finish, best_finish
+        FROM player_recent_form
+    """
+    _SQL_2026_RESULTS = """
+        SELECT player_name, tournament_name, tournament_date, finish_position,
+               score_to_par, earnings
+        FROM tournament_results_2026
+        ORDER BY player_name, tournament_date DESC
+    """
+    # {name_placeholders}: one ? per matching tournament name
+    _SQL_HISTORICAL = """
+        SELECT DISTINCT year, finish_position, score,
+               earnings, sg_total, tournament_name
+        FROM historical_results
+        WHERE player_name = ? AND tournament_name IN ({name_placeholders})
+        ORDER BY year DESC
+    """
+    # Course history summary for every player at once, same rules as the
+    # detailed per-year history
+    _SQL_COURSE_SUMMARIES = f"""
+        WITH matched AS (
+            SELECT DISTINCT player_name, year, finish_position, score, earnings, sg_total, tournament_name
+            FROM historical_results
+            WHERE tournament_name IN ({{name_placeholders}})
+        ),
+        per_year AS (
+            -- One row per player and year: the tournament name closest to the target
+            SELECT player_name, year,
+                   UPPER(TRIM(COALESCE(finish_position, 'None'))) AS fin,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY player_name, year
+                       ORDER BY match_score(?, tournament_name) DESC, tournament_name
+                   ) AS rn
+            FROM matched
+        ),
+        parsed AS (
+            SELECT player_name, year,
+                   CASE WHEN fin IN ({', '.join(f"'{code}'" for code in _NON_FINISHES)}) THEN 70
+                        WHEN REPLACE(fin, 'T', '') != ''
+                         AND REPLACE(fin, 'T', '') NOT GLOB '*[^0-9]*'
+                        THEN CAST(REPLACE(fin, 'T', '') AS INTEGER)
+                   END AS finish
+            FROM per_year
+            WHERE rn = 1
+        )
+        SELECT player_name, COUNT(*), COUNT(finish),
+               SUM(finish = 1), SUM(finish <= 5), SUM(finish <= 10),
+               AVG(finish), MIN(finish), MAX(year)
+        FROM parsed
+        GROUP BY player_name
+    """
+    
     def __init__(self):
         self.base_url = "https://www.pgatour.com"
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept': 'application/json'
         })
+        # All ESPN calls share keep-alive connections instead of a fresh
+        # TCP + TLS handshake per request
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
         self.current_tournament = None
-        self.player_cache = {}
+        # The current tournament changes at most weekly - reuse it for 30 min
+        self._tourney_cache = None
+        self._tourney_cache_time = None
+        # Background venue lookups for calendar-only tournaments
+        self._detail_executor = ThreadPoolExecutor(max_workers=1)
+        self.player_cache = OrderedDict()
+        # Guards player_cache and connection setup - warm_cache reads from worker threads
+        self._lock = threading.Lock()
+        # Per-player scalars, loaded from the small reference tables on first use
+        # and reloaded on the same TTL as player_cache (monotonic load times)
+        self._stats_by_name = None
+        self._form_by_name = None
+        self._reference_time = None
+        # Per-player 2026 results DataFrames, split from one query on first use
+        self._results_by_name = None
+        self._results_time = None
+        # Tournament aliases (lowercase keyword -> (keyword, aliases)), loaded on first use
+        self._tournament_aliases = None
+        # search terms -> matching historical tournament names
+        self._name_matches = {}
+        # tournament name -> (how it matched, matching historical tournament names)
+        self._search_term_cache = {}
+        # tournament name -> {player: course history summary row}
+        self._course_summaries = {}
+        # tournament name -> monotonic time its field was last warmed
+        self._warmed_tournaments = {}
         self.db_path = Path(__file__).parent.parent / "pga_fantasy.db"
+        self._conn = None
 
     def _get_conn(self):
-        """Get database connection (local SQLite)"""
-        return sqlite3.connect(str(self.db_path))
+        """Get the shared database connection (local SQLite), opened on first use"""
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._open_conn()
+        return self._conn
+    
+    def _open_conn(self):
+        """Open the database connection tuned for read-heavy lookups"""
+        # Streamlit reruns on other threads, so the connection is shared
+        # Room for every per-lookup statement (one per IN-list length) in the statement cache
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None,
+                               cached_statements=256)
+        tune_connection(conn)
+        conn.create_function("match_score", 2, _match_score, deterministic=True)
+        if self.db_path not in PGADataFetcher._migrated:
+            self._migrate(conn)
+        return conn
+    
+    def _migrate(self, conn):
+        """Create the lookup index and refresh planner statistics, once per database"""
+        # Per-player 2026 results are read newest first; the other
+        # per-player tables are already covered by their PRIMARY KEY /
+        # UNIQUE(player_name, ...) indexes
+        try:
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_results_player_date
+                ON tournament_results_2026(player_name, tournament_date DESC)
+            """)
+        except sqlite3.OperationalError:
+            return  # Table not created yet - retried on the next connection
+        # Refresh planner statistics only if they are missing or stale
+        conn.execute("PRAGMA optimize")
+        PGADataFetcher._migrated.add(self.db_path)
+    
+    def _load_reference_tables(self):
+        """Load player_stats and player_recent_form (one row per player) into dicts"""
+        conn = self._get_conn()
+        self._stats_by_name = {
+            name: (fedex_rank, season_money, sg_total)
+            for name, fedex_rank, season_money, sg_total in conn.execute(self._SQL_PLAYER_STATS)
+        }
+        self._form_by_name = {
+            name: (form_rating, events, avg, best)
+            for name, form_rating, events, avg, best in conn.execute(self._SQL_RECENT_FORM)
+        }
+        self._reference_time = time.monotonic()
+    
+    def _load_all_2026_results(self):
+        """Load every 2026 result in one query and split it into a DataFrame per player"""
+        rows = self._get_conn().execute(self._SQL_2026_RESULTS).fetchall()
+        df = pd.DataFrame.from_records(
+            rows, columns=['player_name', 'Tournament', 'Date', 'Finish', 'Score', 'Earnings'],
+            coerce_float=True)
+        self._results_by_name = {
+            name: group.drop(columns='player_name').reset_index(drop=True)
+            for name, group in df.groupby('player_name', sort=False)
+        }
+        self._results_time = time.monotonic()
+    
+    def _expired(self, loaded_time):
+        """Whether data loaded at this monotonic time (None if never) is past the cache TTL"""
+        return loaded_time is None or time.monotonic() - loaded_time >= _CACHE_TTL_SECONDS
+    
+    def _load_tournament_aliases(self):
+        """Load aliases from JSON config (editable without touching code)"""
+        aliases_path = Path(__file__).parent.parent / "tournament_aliases.json"
+        raw = {}
+        if aliases_path.exists():
+            try:
+                with open(aliases_path) as f:
+                    raw = json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not load tournament_aliases.json: {e}")
+        
+        # Strip comment keys; keys are matched case-insensitively in file
+        # order, so of two keys differing only in case the first is kept
+        self._tournament_aliases = {}
+        for keyword, aliases in raw.items():
+            if not keyword.startswith('_'):
+                self._tournament_aliases.setdefault(keyword.lower(), (keyword, aliases))
     
     def get_current_tournament(self):
         """Get current week's tournament information from ESPN API"""
+        if (self._tourney_cache is not None
+                and time.monotonic() - self._tourney_cache_time < _TOURNEY_CACHE_TTL_SECONDS):
+            return self._tourney_cache
+        
         try:
             # Fetch live tournament data from ESPN
-            response = requests.get('https://site.api.espn.com/apis/site/v2/sports/golf/pga/scoreboard', timeout=10)
+            response = self.session.get('https://site.api.espn.com/apis/site/v2/sports/golf/pga/scoreboard', timeout=10)
             data = response.json()
             
             events = data.get('events', [])
@@ -58,7 +257,7 @@ class PGADataFetcher:
                             start_date = datetime.strptime(date_str[:10], '%Y-%m-%d')
                             end_date = start_date + timedelta(days=3)
                             dates = f"{start_date.strftime('%b %d')}-{end_date.strftime('%d')}, {start_date.year}"
-                        except:
+                        except ValueError:
                             dates = date_str[:10]
                     
                     tournament_info = {
@@ -70,6 +269,8 @@ class PGADataFetcher:
                     }
                     
                     self.current_tournament = tournament_info
+                    self._tourney_cache = tournament_info
+                    self._tourney_cache_time = time.monotonic()
                     return tournament_info
             
             # No in-progress/scheduled event found — use calendar to find next upcoming
@@ -84,14 +285,14 @@ class PGADataFetcher:
                         continue
                     try:
                         start_date = datetime.strptime(start_str[:10], '%Y-%m-%d')
-                    except:
+                    except ValueError:
                         continue
                     
                     # Find the next tournament that hasn't ended yet
                     end_str = entry.get('endDate', start_str)
                     try:
                         end_date = datetime.strptime(end_str[:10], '%Y-%m-%d')
-                    except:
+                    except ValueError:
                         end_date = start_date + timedelta(days=3)
                     
                     if end_date.date() >= (now - timedelta(days=1)).date():
@@ -99,30 +300,21 @@ class PGADataFetcher:
                         event_id = entry.get('id', '')
                         dates = f"{start_date.strftime('%b %d')}-{end_date.strftime('%d')}, {start_date.year}"
                         
-                        # Try to get venue from the event detail API
-                        course = 'TBD'
-                        try:
-                            detail_url = f"https://site.api.espn.com/apis/site/v2/sports/golf/pga/scoreboard?dates={start_date.strftime('%Y%m%d')}"
-                            detail_resp = requests.get(detail_url, timeout=10)
-                            detail_data = detail_resp.json()
-                            for evt in detail_data.get('events', []):
-                                comps = evt.get('competitions', [])
-                                if comps:
-                                    venue = comps[0].get('venue', {})
-                                    course = venue.get('fullName', 'TBD')
-                                    break
-                        except:
-                            pass
-                        
                         tournament_info = {
                             'name': name,
                             'dates': dates,
-                            'course': course,
+                            'course': 'TBD',
                             'purse': 'TBD',
                             'tournament_id': event_id
                         }
                         
                         self.current_tournament = tournament_info
+                        self._tourney_cache = tournament_info
+                        self._tourney_cache_time = time.monotonic()
+                        
+                        # The venue needs a second ESPN request - resolve it in the
+                        # background and fill it into the cached info when it arrives
+                        self._detail_executor.submit(self._resolve_venue, start_date, tournament_info)
                         return tournament_info
             
             # Nothing found at all
@@ -144,6 +336,21 @@ class PGADataFetcher:
                 'tournament_id': ''
             }
     
+    def _resolve_venue(self, start_date, tournament_info):
+        """Look up the venue for a calendar tournament and update its info in place"""
+        try:
+            detail_url = f"https://site.api.espn.com/apis/site/v2/sports/golf/pga/scoreboard?dates={start_date.strftime('%Y%m%d')}"
+            detail_resp = self.session.get(detail_url, timeout=10)
+            detail_data = detail_resp.json()
+            for evt in detail_data.get('events', []):
+                comps = evt.get('competitions', [])
+                if comps:
+                    venue = comps[0].get('venue', {})
+                    tournament_info['course'] = venue.get('fullName', 'TBD')
+                    break
+        except (requests.RequestException, ValueError):
+            pass
+    
     def get_tournament_field(self, tournament_id=None):
         """Get this week's actual field from ESPN, with DB fallback"""
 
@@ -151,7 +358,7 @@ class PGADataFetcher:
         espn_players = []
         try:
             url = 'https://site.api.espn.com/apis/site/v2/sports/golf/pga/scoreboard'
-            resp = requests.get(url, timeout=10)
+            resp = self.session.get(url, timeout=10)
             data = resp.json()
 
             target_id = str(tournament_id) if tournament_id else None
@@ -171,11 +378,7 @@ class PGADataFetcher:
 
             if espn_players:
                 print(f"  ESPN field: {len(espn_players)} players loaded")
-                df = pd.DataFrame({'player_name': sorted(set(espn_players))})
-                df['player_id'] = None
-                df['fedex_rank'] = None
-                df['world_rank'] = None
-                return df
+                return self._field_frame(sorted(set(espn_players)))
 
         except Exception as e:
             print(f"  ESPN field fetch failed: {e} -- falling back to DB")
@@ -183,223 +386,135 @@ class PGADataFetcher:
         # Step 2: Fall back to all 2026 players in DB
         print("  Using DB fallback for tournament field")
         try:
-            with self._get_conn() as conn:
-                query = """
-                    SELECT DISTINCT player_name
-                    FROM tournament_results_2026
-                    ORDER BY player_name
-                """
-                df = pd.read_sql_query(query, conn)
-                df.columns = ['player_name']
-                df['player_id'] = None
-                df['fedex_rank'] = None
-                df['world_rank'] = None
-                return df
+            conn = self._get_conn()
+            query = """
+                SELECT DISTINCT player_name
+                FROM tournament_results_2026
+                ORDER BY player_name
+            """
+            return self._field_frame([name for (name,) in conn.execute(query)])
 
         except Exception as e:
             print(f"Error fetching field: {e}")
             return pd.DataFrame()
     
-    def get_player_stats(self, player_name, player_id=None, tournament_name=None):
-        """Get comprehensive player statistics from database"""
+    def _field_frame(self, names):
+        """Field DataFrame with typed, still-empty id/rank columns"""
+        n = len(names)
+        # Nullable Int32 instead of all-None object columns
+        return pd.DataFrame({
+            'player_name': pd.Series(names, dtype='string'),
+            'player_id': pd.Series([pd.NA] * n, dtype='Int32'),
+            'fedex_rank': pd.Series([pd.NA] * n, dtype='Int32'),
+            'world_rank': pd.Series([pd.NA] * n, dtype='Int32'),
+        })
+    
+    def get_player_stats(self, player_name, player_id=None, tournament_name=None, detailed=True):
+        """Get comprehensive player statistics from database
+        
+        The course history summary comes from a per-tournament aggregate
+        computed once for the whole field; with detailed=False the per-year
+        rows are skipped and 'detailed_course_history' is left empty.
+        """
         try:
-            # Check cache first
-            if player_name in self.player_cache:
-                cached_time, data = self.player_cache[player_name]
-                if datetime.now() - cached_time < timedelta(hours=24):
-                    return data
+            # Check cache first - course history depends on the tournament,
+            # so it is part of the key
+            cache_key = (player_name, tournament_name, detailed)
+            with self._lock:
+                cached = self.player_cache.get(cache_key)
+                if cached is not None:
+                    cached_time, data = cached
+                    if time.monotonic() - cached_time < _CACHE_TTL_SECONDS:
+                        self.player_cache.move_to_end(cache_key)
+                        return data
+                    del self.player_cache[cache_key]
             
             # Fetch from database
-            with self._get_conn() as conn:
-                # Get player stats
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT fedex_rank, season_money, sg_total
-                    FROM player_stats
-                    WHERE player_name = ?
-                """, (player_name,))
-                
-                stats_row = cursor.fetchone()
-                
-                if stats_row:
-                    fedex_rank, season_money, sg_total = stats_row
-                else:
-                    fedex_rank, season_money, sg_total = None, 0, 0
-                
-                # Get recent form
-                cursor.execute("""
-                    SELECT avg_finish, form_rating
-                    FROM player_recent_form
-                    WHERE player_name = ?
-                """, (player_name,))
-                
-                form_row = cursor.fetchone()
-                recent_form = self._format_form_rating(form_row[1] if form_row else None, player_name)
-                
-                # Get tournament results for 2026
-                results_df = pd.read_sql_query("""
-                    SELECT tournament_name as 'Tournament',
-                           tournament_date as 'Date',
-                           finish_position as 'Finish',
-                           score_to_par as 'Score',
-                           earnings as 'Earnings'
-                    FROM tournament_results_2026
-                    WHERE player_name = ?
-                    ORDER BY tournament_date DESC
-                """, conn, params=(player_name,))
-                
-                # Get tournament history - dynamic based on current tournament
-                if tournament_name:
-                    # Load aliases from JSON config (editable without touching code)
-                    import difflib
-                    aliases_path = Path(__file__).parent.parent / "tournament_aliases.json"
-                    TOURNAMENT_ALIASES = {}
-                    if aliases_path.exists():
-                        try:
-                            with open(aliases_path) as f:
-                                raw = json.load(f)
-                            # Strip comment keys
-                            TOURNAMENT_ALIASES = {k: v for k, v in raw.items() if not k.startswith('_')}
-                        except Exception as e:
-                            print(f"Warning: Could not load tournament_aliases.json: {e}")
-
-                    # Step 1: Try keyword match from aliases
-                    search_terms = None
-                    matched_via = None
-                    for keyword, aliases in TOURNAMENT_ALIASES.items():
-                        if keyword.lower() in tournament_name.lower():
-                            search_terms = aliases
-                            matched_via = f"alias key '{keyword}'"
-                            break
-
-                    # Step 2: Fuzzy fallback — find close DB tournament names
-                    if not search_terms:
-                        try:
-                            all_db_names = pd.read_sql_query(
-                                "SELECT DISTINCT tournament_name FROM historical_results", conn
-                            )['tournament_name'].tolist()
-                            close_matches = difflib.get_close_matches(
-                                tournament_name, all_db_names, n=5, cutoff=0.4
-                            )
-                            if close_matches:
-                                search_terms = close_matches
-                                matched_via = f"fuzzy match {close_matches}"
-                            else:
-                                # Last resort: use last 2 words
-                                words = tournament_name.split()
-                                fallback = ' '.join(words[-2:]) if len(words) >= 2 else tournament_name
-                                search_terms = [fallback]
-                                matched_via = f"last-resort words '{fallback}'"
-                        except Exception as e:
-                            words = tournament_name.split()
-                            fallback = ' '.join(words[-2:]) if len(words) >= 2 else tournament_name
-                            search_terms = [fallback]
-                            matched_via = f"fallback (fuzzy error: {e})"
-
-                    print(f"  Tournament history lookup: '{tournament_name}' → {matched_via}")
+            conn = self._get_conn()
+            # Get player stats and recent form from the in-memory reference tables
+            if self._expired(self._reference_time):
+                self._load_reference_tables()
+            fedex_rank, season_money, sg_total = self._stats_by_name.get(player_name, (None, 0, 0))
+            form_rating, events, avg, best = self._form_by_name.get(player_name, (None, None, None, None))
+            recent_form = self._format_form_rating(form_rating, events=events, avg=avg, best=best)
+            
+            # Get tournament results for 2026 - split per player from one query
+            if self._expired(self._results_time):
+                self._load_all_2026_results()
+            results_df = self._results_by_name.get(player_name)
+            if results_df is None:
+                results_df = pd.DataFrame(columns=['Tournament', 'Date', 'Finish', 'Score', 'Earnings'])
+            
+            # Get tournament history - dynamic based on current tournament
+            if tournament_name:
+                # Search terms depend only on the tournament - resolved once per sweep
+                matched_via, names = self._tournament_search(conn, tournament_name)
+                print(f"  Tournament history lookup: '{tournament_name}' → {matched_via}")
 
-                    # Build OR LIKE query for all name variants
-                    like_clauses = ' OR '.join(['tournament_name LIKE ?' for _ in search_terms])
-                    like_params = [player_name] + [f'%{t}%' for t in search_terms]
+                # Summary row from the field-wide aggregate for this tournament
+                summaries = self._course_summaries_for(conn, tournament_name, names)
+                course_history = self._course_history_dict(summaries.get(player_name))
 
-                    # Get detailed year-by-year tournament history
-                    detailed_history_df = pd.read_sql_query(f"""
-                        SELECT DISTINCT year as 'Year',
-                               finish_position as 'Finish',
-                               score as 'Score',
-                               earnings as 'Earnings',
-                               sg_total as 'SG Total',
-                               tournament_name as 'Tournament'
-                        FROM historical_results
-                        WHERE player_name = ? AND ({like_clauses})
-                        ORDER BY year DESC
-                    """, conn, params=like_params)
+                if detailed:
+                    # Get detailed year-by-year tournament history - exact tournament
+                    # names let SQLite probe the (player_name, tournament_name) unique index
+                    rows = conn.execute(
+                        self._SQL_HISTORICAL.format(name_placeholders=','.join('?' * len(names))),
+                        [player_name] + names).fetchall()
+                    detailed_history_df = pd.DataFrame.from_records(
+                        rows, columns=['Year', 'Finish', 'Score', 'Earnings', 'SG Total', 'Tournament'],
+                        coerce_float=True)
 
                     # If multiple rows per year (from different matching tournament names),
                     # keep the row whose tournament_name most closely matches the target
+                    # (ties go to the alphabetically first name)
                     if not detailed_history_df.empty and detailed_history_df.duplicated(subset=['Year']).any():
-                        import difflib
-                        def best_match_score(t_name):
-                            return difflib.SequenceMatcher(None, tournament_name.lower(), str(t_name).lower()).ratio()
-                        detailed_history_df['_match'] = detailed_history_df['Tournament'].apply(best_match_score)
+                        detailed_history_df['_match'] = detailed_history_df['Tournament'].apply(
+                            lambda t_name: _match_score(tournament_name, t_name))
                         detailed_history_df = (
                             detailed_history_df
-                            .sort_values('_match', ascending=False)
+                            .sort_values(['_match', 'Tournament'], ascending=[False, True], kind='mergesort')
                             .drop_duplicates(subset=['Year'], keep='first')
                             .sort_values('Year', ascending=False)
                             .reset_index(drop=True)
                         )
                         detailed_history_df = detailed_history_df.drop(columns=['_match', 'Tournament'])
-                    
-                    # Compute aggregated stats from detailed history
-                    if not detailed_history_df.empty:
-                        appearances = len(detailed_history_df)
-                        
-                        # Parse finishes (handle "T3", "CUT", "MC", "WD", etc.)
-                        finishes = []
-                        for f in detailed_history_df['Finish']:
-                            try:
-                                f_str = str(f).strip().upper()
-                                if f_str in ('CUT', 'MC', 'MDF', 'WD', 'DQ', 'DNS', 'NONE', 'NAN'):
-                                    finishes.append(70)
-                                else:
-                                    finishes.append(int(f_str.replace('T', '')))
-                            except:
-                                pass
-                        
-                        if finishes:
-                            wins = sum(1 for f in finishes if f == 1)
-                            top_5s = sum(1 for f in finishes if f <= 5)
-                            top_10s = sum(1 for f in finishes if f <= 10)
-                            avg_finish = sum(finishes) / len(finishes)
-                            best_finish = min(finishes) if finishes else 0
-                            last_year = detailed_history_df['Year'].iloc[0] if 'Year' in detailed_history_df else None
-                            
-                            course_history_df = pd.DataFrame([{
-                                'Appearances': appearances,
-                                'Wins': wins,
-                                'Top 5s': top_5s,
-                                'Top 10s': top_10s,
-                                'Avg Finish': round(avg_finish, 1),
-                                'Best': best_finish,
-                                'Last Played': last_year
-                            }])
-                        else:
-                            course_history_df = pd.DataFrame()
-                    else:
-                        course_history_df = pd.DataFrame()
                 else:
-                    # No tournament specified - return empty DataFrames
-                    course_history_df = pd.DataFrame()
                     detailed_history_df = pd.DataFrame()
-                
-                stats = {
-                    'name': player_name,
-                    'player_id': player_id,
-                    'fedex_rank': fedex_rank,
-                    'world_rank': None,  # Not in our database
-                    'season_money': season_money or 0,
-                    'sg_total': sg_total or 0,
-                    'sg_total_rank': None,
-                    'sg_ott': 0,
-                    'sg_app': 0,
-                    'sg_arg': 0,
-                    'sg_putt': 0,
-                    'recent_form': recent_form,
-                    'tournament_results': results_df,
-                    'course_history': course_history_df,
-                    'detailed_course_history': detailed_history_df
-                }
+            else:
+                # No tournament specified - return empty history
+                course_history = {}
+                detailed_history_df = pd.DataFrame()
+            
+            stats = {
+                'name': player_name,
+                'player_id': player_id,
+                'fedex_rank': fedex_rank,
+                'world_rank': None,  # Not in our database
+                'season_money': season_money or 0,
+                'sg_total': sg_total or 0,
+                'sg_total_rank': None,
+                'sg_ott': 0,
+                'sg_app': 0,
+                'sg_arg': 0,
+                'sg_putt': 0,
+                'recent_form': recent_form,
+                'tournament_results': results_df,
+                'course_history': course_history,
+                'detailed_course_history': detailed_history_df
+            }
             
             # Cache the data
-            self.player_cache[player_name] = (datetime.now(), stats)
+            with self._lock:
+                self.player_cache[cache_key] = (time.monotonic(), stats)
+                self.player_cache.move_to_end(cache_key)
+                while len(self.player_cache) > self.PLAYER_CACHE_SIZE:
+                    self.player_cache.popitem(last=False)
             
             return stats
             
         except Exception as e:
             print(f"Error fetching player stats for {player_name}: {e}")
-            import traceback
-            traceback.print_exc()
             return {
                 'name': player_name,
                 'player_id': player_id,
@@ -414,11 +529,105 @@ class PGADataFetcher:
                 'sg_putt': 0,
                 'recent_form': 'N/A',
                 'tournament_results': pd.DataFrame(),
-                'course_history': pd.DataFrame(),
+                'course_history': {},
                 'detailed_course_history': pd.DataFrame()
             }
     
-    def _format_form_rating(self, rating, player_name=None):
+    def _tournament_search(self, conn, tournament_name):
+        """Resolve a tournament to (how it matched, matching historical tournament names), cached"""
+        cached = self._search_term_cache.get(tournament_name)
+        if cached is not None:
+            return cached
+        
+        if self._tournament_aliases is None:
+            self._load_tournament_aliases()
+
+        # Step 1: Try keyword match from aliases - the first key in file
+        # order found in the name wins
+        search_terms = None
+        matched_via = None
+        name_lower = tournament_name.lower()
+        for key_lower, (keyword, aliases) in self._tournament_aliases.items():
+            if key_lower in name_lower:
+                search_terms = aliases
+                matched_via = f"alias key '{keyword}'"
+                break
+
+        # Step 2: Fuzzy fallback — find close DB tournament names
+        if not search_terms:
+            try:
+                all_db_names = [
+                    name for (name,) in conn.execute(
+                        "SELECT DISTINCT tournament_name FROM historical_results")
+                ]
+                close_matches = difflib.get_close_matches(
+                    tournament_name, all_db_names, n=5, cutoff=0.4
+                )
+                if close_matches:
+                    search_terms = close_matches
+                    matched_via = f"fuzzy match {close_matches}"
+                else:
+                    # Last resort: use last 2 words
+                    words = tournament_name.split()
+                    fallback = ' '.join(words[-2:]) if len(words) >= 2 else tournament_name
+                    search_terms = [fallback]
+                    matched_via = f"last-resort words '{fallback}'"
+            except Exception as e:
+                words = tournament_name.split()
+                fallback = ' '.join(words[-2:]) if len(words) >= 2 else tournament_name
+                search_terms = [fallback]
+                matched_via = f"fallback (fuzzy error: {e})"
+                # Don't remember a lookup that only failed over
+                return matched_via, self._matching_tournament_names(conn, search_terms)
+
+        result = (matched_via, self._matching_tournament_names(conn, search_terms))
+        self._search_term_cache[tournament_name] = result
+        return result
+    
+    def _matching_tournament_names(self, conn, search_terms):
+        """All historical tournament names containing any search term (SQL LIKE rules), cached"""
+        key = tuple(search_terms)
+        names = self._name_matches.get(key)
+        if names is None:
+            like_clauses = ' OR '.join(['tournament_name LIKE ?' for _ in search_terms])
+            names = [
+                name for (name,) in conn.execute(
+                    f"SELECT DISTINCT tournament_name FROM historical_results WHERE {like_clauses}",
+                    [f'%{t}%' for t in search_terms])
+            ]
+            self._name_matches[key] = names
+        return names
+    
+    def _course_summaries_for(self, conn, tournament_name, names):
+        """Course history summary rows for every player at a tournament, computed once per tournament"""
+        summaries = self._course_summaries.get(tournament_name)
+        if summaries is None:
+            rows = conn.execute(
+                self._SQL_COURSE_SUMMARIES.format(name_placeholders=','.join('?' * len(names))),
+                names + [tournament_name])
+            summaries = {row[0]: row[1:] for row in rows}
+            self._course_summaries[tournament_name] = summaries
+        return summaries
+    
+    def _course_history_dict(self, summary):
+        """Course history summary as a dict keyed by display column (empty if no finishes)"""
+        if summary is None:
+            return {}
+        appearances, finished, wins, top_5s, top_10s, avg_finish, best_finish, last_year = summary
+        if not finished:
+            return {}
+        
+        return {
+            'Appearances': appearances,
+            'Wins': wins,
+            'Top 5s': top_5s,
+            'Top 10s': top_10s,
+            'Avg Finish': round(avg_finish, 1),
+            'Best': best_finish,
+            'Last Played': last_year
+        }
+    
+    def _format_form_rating(self, rating, events=None, avg=None, best=None):
         """Convert form rating to display string with stats"""
         if rating is None:
             return 'N/A'
@@ -437,23 +646,12 @@ class PGADataFetcher:
         except (ValueError, TypeError):
             return 'N/A'
         
-        # Get actual form stats if we have player_name
+        # Form stats come from the same player_recent_form row as the rating
         stats_detail = ""
-        if player_name:
+        if events and avg:
             try:
-                with self._get_conn() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT recent_events, avg_finish, best_finish
-                        FROM player_recent_form
-                        WHERE player_name = ?
-                    """, (player_name,))
-                    form_row = cursor.fetchone()
-                    if form_row:
-                        events, avg, best = form_row
-                        if events and avg:
-                            stats_detail = f" ({events} events, Avg: {avg:.1f}, Best: {best})"
-            except:
+                stats_detail = f" ({events} events, Avg: {avg:.1f}, Best: {best})"
+            except (TypeError, ValueError):
                 pass
         
         if rating >= 80:
@@ -469,12 +667,56 @@ class PGADataFetcher:
         """Search for a player and return their stats"""
         try:
             return self.get_player_stats(player_name)
-        except:
+        except Exception:
             return None
     
     def refresh_data(self):
         """Refresh all cached data"""
         self.current_tournament = None
+        self._tourney_cache = None
+        self._tourney_cache_time = None
         self.player_cache.clear()
-        self.get_current_tournament()
+        self._stats_by_name = None
+        self._form_by_name = None
+        self._reference_time = None
+        self._results_by_name = None
+        self._results_time = None
+        self._tournament_aliases = None
+        self._name_matches.clear()
+        self._search_term_cache.clear()
+        self._course_summaries.clear()
+        self._warmed_tournaments.clear()
+        tournament = self.get_current_tournament()
+        
+        # Pre-load the whole field so the rankings don't fetch it player by player
+        field = self.get_tournament_field(tournament.get('tournament_id'))
+        if not field.empty:
+            self.warm_cache(field['player_name'], tournament_name=tournament.get('name'))
         return True
+    
+    def warm_cache(self, player_names, tournament_name=None, workers=8):
+        """Load stats for many players into the cache on a thread pool"""
+        # Reference tables, 2026 results and the tournament's history search
+        # are loaded once up front rather than raced for by the first few workers
+        if self._expired(self._reference_time):
+            self._load_reference_tables()
+        if self._expired(self._results_time):
+            self._load_all_2026_results()
+        if tournament_name:
+            conn = self._get_conn()
+            _, names = self._tournament_search(conn, tournament_name)
+            self._course_summaries_for(conn, tournament_name, names)
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda name: self.get_player_stats(name, tournament_name=tournament_name),
+                          player_names))
+        self._warmed_tournaments[tournament_name] = time.monotonic()
+    
+    def warm_field_once(self, player_names, tournament_name=None):
+        """warm_cache a tournament's field unless it was warmed within the cache TTL
+        
+        Called on every rankings render - only the first (or the first after
+        refresh_data / the TTL) pays for the thread pool sweep.
+        """
+        if self._expired(self._warmed_tournaments.get(tournament_name)):
+            self.warm_cache(player_names, tournament_name=tournament_name)
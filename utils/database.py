@@ -1,19 +1,124 @@
 import sqlite3
+import threading
 import pandas as pd
 
 from datetime import datetime
 from pathlib import Path
 
+def tune_connection(conn, writer=False, cache_kib=20000):
+    """Apply the per-connection cache PRAGMAs, and for writers the WAL journal
+    
+    journal_mode=WAL is stored in the database file, so only the scripts
+    that write (DatabaseManager, the tracker) switch to it - with WAL,
+    readers no longer block on a write, and synchronous=NORMAL fsyncs at
+    checkpoints rather than every commit. Read-only connections leave the
+    file's journal mode alone.
+    """
+    if writer:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA cache_size=-{int(cache_kib)}")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    return conn
+
+def checkpoint_wal(conn, mode="PASSIVE"):
+    """Copy committed WAL pages into the database file itself
+    
+    *.db-wal is not tracked in git, so writers checkpoint after changing
+    picks and when closing - TRUNCATE (which waits for readers) also
+    empties the WAL file. The data is already committed, so a failed
+    checkpoint is left for the next one.
+    """
+    try:
+        conn.execute(f"PRAGMA wal_checkpoint({mode})")
+    except sqlite3.OperationalError:
+        pass
+
 class DatabaseManager:
     """Manages SQLite database for player picks and history"""
     
+    # Database files whose tables this process has already created, so
+    # later DatabaseManager() calls (one per ranked field) skip init_database
+    _initialized = set()
+    
+    # Hot statements as fixed text, so each thread's persistent connection
+    # reuses the prepared statement from its statement cache
+    _SQL_CLAIM_PLAYER = """
+        INSERT OR IGNORE INTO used_players (player_name, tournament_name, week_used)
+        VALUES (?, ?, ?)
+    """
+    _SQL_INSERT_PICK = """
+        INSERT INTO picks (player_name, tournament_name, tournament_date)
+        VALUES (?, ?, ?)
+    """
+    _SQL_USED_PLAYERS = "SELECT player_name FROM used_players"
+    _SQL_USED_WEEK = "SELECT tournament_name FROM used_players WHERE player_name = ?"
+    _SQL_ALL_PICKS = """
+        SELECT player_name, tournament_name, tournament_date,
+               finish_position, money_won, pick_date
+        FROM picks
+        ORDER BY tournament_date DESC
+    """
+    _SQL_UPDATE_RESULTS = """
+        UPDATE picks 
+        SET finish_position = ?, 
+            money_won = ?,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE player_name = ? AND tournament_name = ?
+    """
+    _SQL_CACHE_STATS = """
+        INSERT OR REPLACE INTO player_stats_cache (player_name, stats_json, last_updated)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+    """
+    _SQL_CACHED_STATS = """
+        SELECT stats_json, last_updated
+        FROM player_stats_cache
+        WHERE player_name = ?
+        AND datetime(last_updated) > datetime('now', '-' || ? || ' hours')
+    """
+    _SQL_CACHED_FIELD = """
+        SELECT json_extract(stats_json, ?)
+        FROM player_stats_cache
+        WHERE player_name = ?
+        AND datetime(last_updated) > datetime('now', '-' || ? || ' hours')
+    """
+    
     def __init__(self, db_path="pga_fantasy.db"):
         self.db_path = Path(__file__).parent.parent / db_path
-        self.init_database()
+        # One persistent connection per thread - Streamlit sessions run on
+        # their own threads, and a connection's transaction must not be shared
+        self._local = threading.local()
+        # (connection, PRAGMA data_version, names list, names frozenset) for
+        # used_players - reset by our own writes, and data_version changes
+        # when another connection (e.g. add_pick.py) commits
+        self._used_cache = None
+        if self.db_path not in DatabaseManager._initialized:
+            self.init_database()
+            DatabaseManager._initialized.add(self.db_path)
 
     def _get_conn(self):
-        """Get database connection (local SQLite)"""
-        return sqlite3.connect(str(self.db_path))
+        """Get this thread's database connection (local SQLite), opened on first use
+        
+        Used as `with self._get_conn() as conn:` - the block commits or rolls
+        back, but the connection stays open for the next call.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open_conn()
+        return conn
+    
+    def _open_conn(self):
+        """Open a database connection with the journal and cache PRAGMAs set"""
+        return tune_connection(sqlite3.connect(str(self.db_path)), writer=True)
+    
+    def close(self):
+        """Close this thread's connection (reopened on next use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            checkpoint_wal(conn, "TRUNCATE")
+            conn.close()
+            self._local.conn = None
     
     def init_database(self):
         """Initialize database tables"""
@@ -53,7 +158,20 @@ class DatabaseManager:
                 )
             """)
             
+            # Indexes for the pick lookups (used_players is keyed by its PRIMARY KEY)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_picks_player_tournament
+                ON picks(player_name, tournament_name)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_picks_tournament_date
+                ON picks(tournament_date DESC)
+            """)
+            
             conn.commit()
+            
+            # Refresh planner statistics only if they are missing or stale
+            cursor.execute("PRAGMA optimize")
     
     def add_pick(self, player_name, tournament_name, tournament_date=None):
         """Add a new player pick"""
@@ -64,28 +182,19 @@ class DatabaseManager:
             with self._get_conn() as conn:
                 cursor = conn.cursor()
                 
-                # Check if player already used
-                cursor.execute(
-                    "SELECT player_name FROM used_players WHERE player_name = ?",
-                    (player_name,)
-                )
-                if cursor.fetchone():
+                # Claim the player in used_players - the PRIMARY KEY rejects
+                # an already-used player, so no separate check is needed
+                week_used = datetime.now().strftime("%Y-W%U")
+                cursor.execute(self._SQL_CLAIM_PLAYER, (player_name, tournament_name, week_used))
+                if cursor.rowcount == 0:
                     return False
                 
                 # Add to picks
-                cursor.execute("""
-                    INSERT INTO picks (player_name, tournament_name, tournament_date)
-                    VALUES (?, ?, ?)
-                """, (player_name, tournament_name, tournament_date))
-                
-                # Add to used_players
-                week_used = datetime.now().strftime("%Y-W%U")
-                cursor.execute("""
-                    INSERT INTO used_players (player_name, tournament_name, week_used)
-                    VALUES (?, ?, ?)
-                """, (player_name, tournament_name, week_used))
+                cursor.execute(self._SQL_INSERT_PICK, (player_name, tournament_name, tournament_date))
                 
                 conn.commit()
+                self._used_cache = None
+                checkpoint_wal(conn)
                 return True
         except Exception as e:
             print(f"Error adding pick: {e}")
@@ -93,31 +202,34 @@ class DatabaseManager:
     
     def is_player_used(self, player_name):
         """Check if player has already been picked"""
-        with self._get_conn() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT player_name FROM used_players WHERE player_name = ?",
-                (player_name,)
-            )
-            return cursor.fetchone() is not None
+        return player_name in self.get_used_players_set()
+    
+    def _load_used_players(self):
+        """Get the used_players cache entry, re-reading the table only if it changed"""
+        conn = self._get_conn()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        cached = self._used_cache
+        if cached is None or cached[0] is not conn or cached[1] != version:
+            with conn:
+                cursor = conn.cursor()
+                cursor.execute(self._SQL_USED_PLAYERS)
+                names = [row[0] for row in cursor.fetchall()]
+            cached = self._used_cache = (conn, version, names, frozenset(names))
+        return cached
     
     def get_used_players(self):
         """Get list of all used players"""
-        with self._get_conn() as conn:
-            df = pd.read_sql_query(
-                "SELECT player_name FROM used_players",
-                conn
-            )
-            return df['player_name'].tolist() if not df.empty else []
+        return list(self._load_used_players()[2])
+    
+    def get_used_players_set(self):
+        """Get all used players as a frozenset, for membership checks"""
+        return self._load_used_players()[3]
     
     def get_player_used_week(self, player_name):
         """Get the tournament name when player was used"""
         with self._get_conn() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT tournament_name FROM used_players WHERE player_name = ?",
-                (player_name,)
-            )
+            cursor.execute(self._SQL_USED_WEEK, (player_name,))
             result = cursor.fetchone()
             return result[0] if result else None
     
@@ -130,32 +242,27 @@ class DatabaseManager:
     
     def get_all_picks(self):
         """Get all picks with details"""
+        return pd.DataFrame.from_records(
+            self.get_all_picks_rows(),
+            columns=['Player', 'Tournament', 'Date', 'Finish', 'Money Won', 'Pick Date']
+        )
+    
+    def get_all_picks_rows(self):
+        """Get all picks as (player, tournament, date, finish, money won, pick date) tuples"""
         with self._get_conn() as conn:
-            return pd.read_sql_query("""
-                SELECT 
-                    player_name as 'Player',
-                    tournament_name as 'Tournament',
-                    tournament_date as 'Date',
-                    finish_position as 'Finish',
-                    money_won as 'Money Won',
-                    pick_date as 'Pick Date'
-                FROM picks
-                ORDER BY tournament_date DESC
-            """, conn)
+            cursor = conn.cursor()
+            cursor.execute(self._SQL_ALL_PICKS)
+            return cursor.fetchall()
     
     def update_pick_results(self, player_name, tournament_name, finish_position, money_won):
         """Update pick with tournament results"""
         try:
             with self._get_conn() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE picks 
-                    SET finish_position = ?, 
-                        money_won = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE player_name = ? AND tournament_name = ?
-                """, (finish_position, money_won, player_name, tournament_name))
+                cursor.execute(self._SQL_UPDATE_RESULTS,
+                               (finish_position, money_won, player_name, tournament_name))
                 conn.commit()
+                checkpoint_wal(conn)
                 return cursor.rowcount > 0
         except Exception as e:
             print(f"Error updating pick results: {e}")
@@ -166,10 +273,7 @@ class DatabaseManager:
         try:
             with self._get_conn() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO player_stats_cache (player_name, stats_json, last_updated)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (player_name, stats_json))
+                cursor.execute(self._SQL_CACHE_STATS, (player_name, stats_json))
                 conn.commit()
                 return True
         except Exception as e:
@@ -180,12 +284,20 @@ class DatabaseManager:
         """Get cached player stats if fresh enough"""
         with self._get_conn() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT stats_json, last_updated
-                FROM player_stats_cache
-                WHERE player_name = ?
-                AND datetime(last_updated) > datetime('now', '-' || ? || ' hours')
-            """, (player_name, max_age_hours))
+            cursor.execute(self._SQL_CACHED_STATS, (player_name, max_age_hours))
+            result = cursor.fetchone()
+            return result[0] if result else None
+    
+    def get_cached_field(self, player_name, json_path, max_age_hours=24):
+        """Get one field of cached player stats, e.g. json_path='$.fedex_rank'
+        
+        SQLite's json_extract reads the value out of the stored JSON, so the
+        whole payload is never parsed in Python. Returns None if the stats are
+        missing, stale, or have no such field.
+        """
+        with self._get_conn() as conn:
+            cursor = conn.cursor()
+            cursor.execute(self._SQL_CACHED_FIELD, (json_path, player_name, max_age_hours))
             result = cursor.fetchone()
             return result[0] if result else None
     
@@ -197,6 +309,8 @@ class DatabaseManager:
                 cursor.execute("DELETE FROM picks")
                 cursor.execute("DELETE FROM used_players")
                 conn.commit()
+                self._used_cache = None
+                checkpoint_wal(conn)
                 return True
         except Exception as e:
             print(f"Error clearing season data: {e}")
@@ -208,20 +322,20 @@ class DatabaseManager:
             with self._get_conn() as conn:
                 cursor = conn.cursor()
                 
-                for pick in picks_data:
-                    # Add to picks
-                    cursor.execute("""
-                        INSERT INTO picks (player_name, tournament_name, tournament_date)
-                        VALUES (?, ?, ?)
-                    """, (pick['player_name'], pick['tournament_name'], pick['tournament_date']))
-                    
-                    # Add to used_players
-                    cursor.execute("""
-                        INSERT OR IGNORE INTO used_players (player_name, tournament_name, week_used)
-                        VALUES (?, ?, ?)
-                    """, (pick['player_name'], pick['tournament_name'], pick.get('week_used', 'Historical')))
+                # Add to picks and used_players - one executemany each, all
+                # committed together
+                cursor.executemany(self._SQL_INSERT_PICK, [
+                    (pick['player_name'], pick['tournament_name'], pick['tournament_date'])
+                    for pick in picks_data
+                ])
+                cursor.executemany(self._SQL_CLAIM_PLAYER, [
+                    (pick['player_name'], pick['tournament_name'], pick.get('week_used', 'Historical'))
+                    for pick in picks_data
+                ])
                 
                 conn.commit()
+                self._used_cache = None
+                checkpoint_wal(conn)
                 return True
         except Exception as e:
             print(f"Error adding historical picks: {e}")
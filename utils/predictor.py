@@ -1,3 +1,4 @@
+import functools
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -5,6 +6,15 @@ from datetime import datetime
 class WinPredictor:
     """Calculates win probabilities and value scores for players"""
     
+    # Recent form label -> score (unlisted labels score 50)
+    _FORM_SCORES = {
+        '🔥 Excellent': 90,
+        '✅ Good': 70,
+        '🔶 Average': 50,
+        '🔻 Poor': 30,
+        'N/A': 50
+    }
+    
     def __init__(self):
         self.weights = {
             'fedex_rank': 0.20,
@@ -14,13 +24,20 @@ class WinPredictor:
             'course_history': 0.25
         }
     
-    def get_ranked_field(self, tournament_info):
-        """Get tournament field ranked by win probability"""
+    def get_ranked_field(self, tournament_info, data_fetcher=None, db_manager=None):
+        """Get tournament field ranked by win probability
+        
+        Pass the app's long-lived fetcher and database manager to rank from
+        their caches (e.g. what refresh_data pre-loaded); fresh ones are
+        created otherwise.
+        """
         from utils.data_fetcher import PGADataFetcher
         from utils.database import DatabaseManager
         
-        data_fetcher = PGADataFetcher()
-        db_manager = DatabaseManager()
+        if data_fetcher is None:
+            data_fetcher = PGADataFetcher()
+        if db_manager is None:
+            db_manager = DatabaseManager()
         
         # Get tournament field
         field_df = data_fetcher.get_tournament_field(tournament_info.get('tournament_id'))
@@ -29,28 +46,38 @@ class WinPredictor:
             # Return sample data if no real data available
             field_df = self._get_sample_field()
         
+        # Used players loaded once - membership checks below are set lookups
+        used_set = db_manager.get_used_players_set()
+        
+        # Load the field's stats on the fetcher's thread pool (once per
+        # tournament); the loop below then reads them back from its cache
+        data_fetcher.warm_field_once(field_df['player_name'], tournament_name=tournament_info.get('name'))
+        
+        # Gather stats for each player
+        field_stats = [
+            (player.player_name, data_fetcher.get_player_stats(
+                player.player_name,
+                getattr(player, 'player_id', None),
+                tournament_name=tournament_info.get('name')
+            ))
+            for player in field_df.itertuples(index=False)
+        ]
+        all_stats = [player_stats for _, player_stats in field_stats]
+        
+        # Win probability and value score for the whole field at once
+        win_probs = self._calculate_win_probabilities(all_stats, tournament_info)
+        value_scores = self._calculate_value_scores(all_stats, win_probs)
+        
         # Calculate predictions for each player
         predictions = []
         
-        for _, player in field_df.iterrows():
-            player_stats = data_fetcher.get_player_stats(
-                player['player_name'],
-                player.get('player_id'),
-                tournament_name=tournament_info.get('name')
-            )
-            
-            # Calculate win probability
-            win_prob = self._calculate_win_probability(player_stats, tournament_info)
-            
-            # Calculate value score
-            value_score = self._calculate_value_score(player_stats, win_prob)
-            
+        for (player_name, player_stats), win_prob, value_score in zip(field_stats, win_probs, value_scores):
             # Check if player is already used
-            is_used = db_manager.is_player_used(player['player_name'])
+            is_used = player_name in used_set
             
             predictions.append({
                 'rank': 0,  # Will be set after sorting
-                'player_name': player['player_name'],
+                'player_name': player_name,
                 'win_probability': win_prob,
                 'value_score': value_score,
                 'fedex_rank': player_stats.get('fedex_rank', 'N/A'),
@@ -76,42 +103,42 @@ class WinPredictor:
         
         return predictions_df
     
-    def _calculate_win_probability(self, player_stats, tournament_info):
-        """Calculate win probability based on multiple factors"""
+    def _round2(self, values):
+        """Round to 2 decimals exactly as round() does - np.round can differ by 0.01 on halves"""
+        return np.array([round(v, 2) for v in values.tolist()])
+    
+    def _rank_array(self, stats_list, key):
+        """Ranks from each player's stats as floats, defaulting to middle rank (100) if None"""
+        return np.array([100 if s.get(key) is None else s.get(key) for s in stats_list], dtype=float)
+    
+    def _calculate_win_probabilities(self, stats_list, tournament_info):
+        """Calculate win probabilities for a list of player stats based on multiple factors"""
         
         # Base probability from rankings (handle None values)
-        fedex_rank = player_stats.get('fedex_rank')
-        world_rank = player_stats.get('world_rank')
-        
-        # Default to middle rank if None
-        if fedex_rank is None:
-            fedex_rank = 100
-        if world_rank is None:
-            world_rank = 100
+        fedex_rank = self._rank_array(stats_list, 'fedex_rank')
+        world_rank = self._rank_array(stats_list, 'world_rank')
         
         # Convert ranks to scores (lower rank = higher score)
-        fedex_score = max(0, (200 - fedex_rank) / 200) * 100
-        world_score = max(0, (200 - world_rank) / 200) * 100
+        fedex_score = np.maximum(0, (200 - fedex_rank) / 200) * 100
+        world_score = np.maximum(0, (200 - world_rank) / 200) * 100
         
         # Strokes gained score
-        sg_total = player_stats.get('sg_total', 0)
-        sg_score = min(100, max(0, (sg_total + 2) * 20))  # Normalize around 0, cap at 100
+        sg_total = np.array([s.get('sg_total', 0) for s in stats_list], dtype=float)
+        sg_score = np.minimum(100, np.maximum(0, (sg_total + 2) * 20))  # Normalize around 0, cap at 100
         
         # Recent form score (simplified)
-        form = player_stats.get('recent_form', 'N/A')
-        form_scores = {
-            '🔥 Excellent': 90,
-            '✅ Good': 70,
-            '🔶 Average': 50,
-            '🔻 Poor': 30,
-            'N/A': 50
-        }
-        form_score = form_scores.get(form, 50)
+        form_score = (
+            pd.Series([s.get('recent_form', 'N/A') for s in stats_list], dtype=object)
+            .map(self._FORM_SCORES).fillna(50).to_numpy(dtype=float)
+        )
         
-        # Course history score
-        course_history = player_stats.get('course_history', pd.DataFrame())
-        detailed_course_history = player_stats.get('detailed_course_history', pd.DataFrame())
-        course_score = self._calculate_course_history_score(course_history, detailed_course_history)
+        # Course history score - per player, from their history DataFrames
+        course_score = np.array([
+            self._calculate_course_history_score(
+                s.get('course_history', {}),
+                s.get('detailed_course_history', pd.DataFrame()))
+            for s in stats_list
+        ], dtype=float)
         
         # Weighted average
         win_prob = (
@@ -125,147 +152,160 @@ class WinPredictor:
         # Normalize to reasonable probability range (0.1% to 25%)
         win_prob = 0.1 + (win_prob / 100) * 24.9
         
-        return round(win_prob, 2)
+        return self._round2(win_prob)
     
-    def _calculate_course_history_score(self, course_history_df, detailed_history_df=None):
-        """Calculate score based on course history with recency weighting"""
-        if course_history_df.empty:
+    def _calculate_course_history_score(self, course_history, detailed_history_df=None):
+        """Calculate score based on course history (summary dict) with recency weighting"""
+        if not course_history:
             return 50  # Neutral score if no history
 
         try:
-            current_year = datetime.now().year
-
             # If we have detailed year-by-year data, use recency-weighted scoring
             if detailed_history_df is not None and not detailed_history_df.empty:
-                weighted_finish_sum = 0
-                weight_total = 0
-                weighted_wins = 0
-                weighted_top5s = 0
-                weighted_top10s = 0
+                results = tuple(zip(detailed_history_df['Year'].tolist(),
+                                    detailed_history_df['Finish'].tolist()))
+                return self._weighted_history_score(results, datetime.now().year)
 
-                for _, row in detailed_history_df.iterrows():
-                    try:
-                        year = int(row.get('Year', current_year))
-                        f_str = str(row.get('Finish', '')).strip().upper()
-                        if f_str in ('CUT', 'MC', 'MDF', 'WD', 'DQ', 'DNS', 'NONE', 'NAN'):
-                            finish = 70
-                        else:
-                            finish = int(f_str.replace('T', ''))
-                    except:
-                        continue
+            # Fallback: use aggregated stats (no recency weighting)
+            row = course_history
+            return self._summary_history_score(
+                row.get('Wins', 0) or 0,
+                row.get('Top 5s', 0) or 0,
+                row.get('Top 10s', 0) or 0,
+                row.get('Avg Finish', 50),
+                row.get('Appearances', 0) or 0
+            )
 
-                    # Sliding scale: 1.0 for current year, -0.15 per year, floor 0.30
-                    age = current_year - year
-                    weight = max(0.30, 1.0 - age * 0.15)
+        except Exception as e:
+            print(f"Error calculating course history score: {e}")
+            return 50
+    
+    # The two scorers below are pure functions of hashable inputs, memoized
+    # because the same histories are re-scored on every Streamlit re-render
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _weighted_history_score(results, current_year):
+        """Recency-weighted course history score from (year, finish) pairs"""
+        weighted_finish_sum = 0
+        weight_total = 0
+        weighted_wins = 0
+        weighted_top5s = 0
+        weighted_top10s = 0
 
-                    weighted_finish_sum += finish * weight
-                    weight_total += weight
-                    if finish == 1:
-                        weighted_wins += weight
-                    if finish <= 5:
-                        weighted_top5s += weight
-                    if finish <= 10:
-                        weighted_top10s += weight
+        for year, finish in results:
+            try:
+                year = int(year)
+                f_str = str(finish).strip().upper()
+                if f_str in ('CUT', 'MC', 'MDF', 'WD', 'DQ', 'DNS', 'NONE', 'NAN'):
+                    finish = 70
+                else:
+                    finish = int(f_str.replace('T', ''))
+            except:
+                continue
 
-                if weight_total == 0:
-                    return 50
+            # Sliding scale: 1.0 for current year, -0.15 per year, floor 0.30
+            age = current_year - year
+            weight = max(0.30, 1.0 - age * 0.15)
 
-                weighted_avg = weighted_finish_sum / weight_total
+            weighted_finish_sum += finish * weight
+            weight_total += weight
+            if finish == 1:
+                weighted_wins += weight
+            if finish <= 5:
+                weighted_top5s += weight
+            if finish <= 10:
+                weighted_top10s += weight
 
-                score = 50  # Start neutral
+        if weight_total == 0:
+            return 50
 
-                # Wins — tempered by weighted avg finish
-                if weighted_wins > 0:
-                    win_bonus = 20 * weighted_wins
-                    if weighted_avg > 40:
-                        win_bonus *= 0.4
-                    elif weighted_avg > 30:
-                        win_bonus *= 0.7
-                    score += win_bonus
+        weighted_avg = weighted_finish_sum / weight_total
 
-                score += weighted_top5s * 8
-                score += weighted_top10s * 4
+        score = 50  # Start neutral
 
-                # Weighted avg finish contribution
-                if weighted_avg < 20:
-                    score += 25
-                elif weighted_avg < 30:
-                    score += 15
-                elif weighted_avg < 40:
-                    score += 5
-                elif weighted_avg > 50:
-                    score -= 10
+        # Wins — tempered by weighted avg finish
+        if weighted_wins > 0:
+            win_bonus = 20 * weighted_wins
+            if weighted_avg > 40:
+                win_bonus *= 0.4
+            elif weighted_avg > 30:
+                win_bonus *= 0.7
+            score += win_bonus
 
-                appearances = len(detailed_history_df)
-                if appearances >= 5:
-                    score += 5
+        score += weighted_top5s * 8
+        score += weighted_top10s * 4
 
-                return min(100, max(20, score))
+        # Weighted avg finish contribution
+        if weighted_avg < 20:
+            score += 25
+        elif weighted_avg < 30:
+            score += 15
+        elif weighted_avg < 40:
+            score += 5
+        elif weighted_avg > 50:
+            score -= 10
 
-            # Fallback: use aggregated stats (no recency weighting)
-            row = course_history_df.iloc[0]
-            wins = row.get('Wins', 0) or 0
-            top_5s = row.get('Top 5s', 0) or 0
-            top_10s = row.get('Top 10s', 0) or 0
-            avg_finish = row.get('Avg Finish', 50)
-            appearances = row.get('Appearances', 0) or 0
+        appearances = len(results)
+        if appearances >= 5:
+            score += 5
 
-            score = 50
-            if wins > 0:
-                win_bonus = 20 * wins
-                if avg_finish and avg_finish > 40:
-                    win_bonus *= 0.4
-                elif avg_finish and avg_finish > 30:
-                    win_bonus *= 0.7
-                score += win_bonus
-            score += top_5s * 8
-            score += top_10s * 4
-            if avg_finish:
-                if avg_finish < 20:
-                    score += 25
-                elif avg_finish < 30:
-                    score += 15
-                elif avg_finish < 40:
-                    score += 5
-                elif avg_finish > 50:
-                    score -= 10
-            if appearances >= 5:
+        return min(100, max(20, score))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _summary_history_score(wins, top_5s, top_10s, avg_finish, appearances):
+        """Course history score from the aggregated summary (no recency weighting)"""
+        score = 50
+        if wins > 0:
+            win_bonus = 20 * wins
+            if avg_finish and avg_finish > 40:
+                win_bonus *= 0.4
+            elif avg_finish and avg_finish > 30:
+                win_bonus *= 0.7
+            score += win_bonus
+        score += top_5s * 8
+        score += top_10s * 4
+        if avg_finish:
+            if avg_finish < 20:
+                score += 25
+            elif avg_finish < 30:
+                score += 15
+            elif avg_finish < 40:
                 score += 5
+            elif avg_finish > 50:
+                score -= 10
+        if appearances >= 5:
+            score += 5
 
-            return min(100, max(20, score))
-
-        except Exception as e:
-            print(f"Error calculating course history score: {e}")
-            return 50
+        return min(100, max(20, score))
     
-    def _calculate_value_score(self, player_stats, win_probability):
-        """Calculate value score (probability relative to ranking)"""
+    def _calculate_value_scores(self, stats_list, win_probabilities):
+        """Calculate value scores (probability relative to ranking) for a list of player stats"""
         
         # Value is when win probability is high relative to ranking
         # Lower ranked players with decent win probability = high value
         
-        fedex_rank = player_stats.get('fedex_rank')
-        if fedex_rank is None:
-            fedex_rank = 100
+        fedex_rank = self._rank_array(stats_list, 'fedex_rank')
         
-        # Expected win probability based on rank
-        expected_prob = max(0.1, (200 - fedex_rank) / 200 * 15)
+        # Expected win probability based on rank (never below 0.1)
+        expected_prob = np.maximum(0.1, (200 - fedex_rank) / 200 * 15)
         
         # Value is the ratio of actual to expected
-        value_ratio = win_probability / expected_prob if expected_prob > 0 else 1
+        value_ratio = win_probabilities / expected_prob
         
         # Convert to 0-100 scale
-        value_score = min(100, value_ratio * 50)
+        value_score = np.minimum(100, value_ratio * 50)
         
-        return round(value_score, 2)
+        return self._round2(value_score)
     
-    def _format_course_history(self, course_history_df, detailed_history_df=None):
-        """Format course history for display with recency-weighted rating"""
-        if course_history_df is None or course_history_df.empty:
+    def _format_course_history(self, course_history, detailed_history_df=None):
+        """Format course history (summary dict) for display with recency-weighted rating"""
+        if not course_history:
             return "No history"
         
         try:
-            row = course_history_df.iloc[0]
+            row = course_history
             wins = row.get('Wins', 0) or 0
             top_5s = row.get('Top 5s', 0) or 0
             top_10s = row.get('Top 10s', 0) or 0
@@ -295,7 +335,7 @@ class WinPredictor:
                 weighted_wins = 0
                 weighted_top10s = 0
 
-                for _, r in detailed_history_df.iterrows():
+                for r in detailed_history_df.to_dict('records'):
                     try:
                         year = int(r.get('Year', current_year))
                         f_str = str(r.get('Finish', '')).strip().upper()
@@ -371,8 +411,12 @@ class WinPredictor:
         
         multiplier = multipliers.get(field_strength, 1.0)
         
-        predictions_df['win_probability'] = predictions_df['win_probability'] * multiplier
-        predictions_df['win_probability'] = predictions_df['win_probability'].clip(0.1, 25.0)
+        # Scale and clip in one float buffer, assigned back once - the column's
+        # own array is a read-only view under pandas copy-on-write
+        win_probs = predictions_df['win_probability'].to_numpy(dtype=float, copy=True)
+        np.multiply(win_probs, multiplier, out=win_probs)
+        np.clip(win_probs, 0.1, 25.0, out=win_probs)
+        predictions_df['win_probability'] = win_probs
         
         return predictions_df
     
@@ -4,6 +4,69 @@ View your season picks history
 import sqlite3
 import pandas as pd
 
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+# All picks with results; {db} is the schema prefix ("" for sqlite3, "s."
+# for the database attached in DuckDB)
+PICKS_QUERY = """
+    SELECT 
+        p.player_name as "Player",
+        p.tournament_name as "Tournament",
+        p.tournament_date as "Date",
+        t.finish_position as "Finish",
+        t.earnings as "Earnings",
+        t.fedex_points as "FedEx Pts"
+    FROM {db}picks p
+    LEFT JOIN {db}tournament_results_2026 t 
+        ON p.player_name = t.player_name 
+        AND p.tournament_name = t.tournament_name
+    ORDER BY p.tournament_date DESC
+"""
+
+# Season totals over the same join (picks without a result count as 0)
+TOTALS_QUERY = """
+    SELECT 
+        COALESCE(SUM(t.earnings), 0),
+        COALESCE(SUM(t.fedex_points), 0)
+    FROM {db}picks p
+    LEFT JOIN {db}tournament_results_2026 t 
+        ON p.player_name = t.player_name 
+        AND p.tournament_name = t.tournament_name
+"""
+
+def _fetch_picks_duckdb(db_path):
+    """Run the picks and totals queries in DuckDB over the SQLite file, or None if unavailable"""
+    try:
+        con = duckdb.connect()
+        try:
+            # Only use the sqlite extension if it is already installed -
+            # never download it just to print the picks
+            installed = con.execute(
+                "SELECT installed FROM duckdb_extensions() WHERE extension_name IN ('sqlite', 'sqlite_scanner')"
+            ).fetchone()
+            if not (installed and installed[0]):
+                return None
+            con.execute("LOAD sqlite")
+            con.execute(f"ATTACH '{db_path}' AS s (TYPE sqlite, READ_ONLY)")
+            cursor = con.execute(PICKS_QUERY.format(db="s."))
+            columns, rows = [col[0] for col in cursor.description], cursor.fetchall()
+            return columns, rows, con.execute(TOTALS_QUERY.format(db="s.")).fetchone()
+        finally:
+            con.close()
+    except duckdb.Error:
+        return None
+
+def _fetch_picks_sqlite(db_path):
+    """Run the picks and totals queries with sqlite3"""
+    with sqlite3.connect(db_path) as conn:
+        cursor = conn.execute(PICKS_QUERY.format(db=""))
+        columns, rows = [col[0] for col in cursor.description], cursor.fetchall()
+        return columns, rows, conn.execute(TOTALS_QUERY.format(db="")).fetchone()
+
 def view_picks_history():
     print("=" * 60)
     print("📋 YOUR 2026 PICKS HISTORY")
@@ -11,41 +74,25 @@ def view_picks_history():
     
     db_path = "pga_fantasy.db"
     
-    with sqlite3.connect(db_path) as conn:
-        # Get all picks with results
-        query = """
-            SELECT 
-                p.player_name as 'Player',
-                p.tournament_name as 'Tournament',
-                p.tournament_date as 'Date',
-                t.finish_position as 'Finish',
-                t.earnings as 'Earnings',
-                t.fedex_points as 'FedEx Pts'
-            FROM picks p
-            LEFT JOIN tournament_results_2026 t 
-                ON p.player_name = t.player_name 
-                AND p.tournament_name = t.tournament_name
-            ORDER BY p.tournament_date DESC
-        """
-        
-        df = pd.read_sql_query(query, conn)
+    # DuckDB's columnar join when it is installed, sqlite3 otherwise
+    result = _fetch_picks_duckdb(db_path) if HAS_DUCKDB else None
+    if result is None:
+        result = _fetch_picks_sqlite(db_path)
+    columns, rows, (total_earnings, total_fedex) = result
+    
+    if not rows:
+        print("No picks recorded yet.\n")
+        print("Add your first pick with: python add_pick.py")
+    else:
+        print(f"\n{len(rows)} picks used:\n")
+        # pandas only lays out the table; the totals are summed in SQL
+        print(pd.DataFrame.from_records(rows, columns=columns).to_string(index=False))
         
-        if df.empty:
-            print("No picks recorded yet.\n")
-            print("Add your first pick with: python add_pick.py")
-        else:
-            print(f"\n{len(df)} picks used:\n")
-            print(df.to_string(index=False))
-            
-            # Calculate totals
-            total_earnings = df['Earnings'].sum()
-            total_fedex = df['FedEx Pts'].sum()
-            
-            print("\n" + "=" * 60)
-            print(f"💰 Total Earnings: ${total_earnings:,.0f}" if total_earnings else "💰 Total Earnings: $0")
-            print(f"🏆 Total FedEx Points: {total_fedex:.0f}" if total_fedex else "🏆 Total FedEx Points: 0")
-            print(f"📊 Picks Remaining: {200 - len(df)}")
-            print("=" * 60)
+        print("\n" + "=" * 60)
+        print(f"💰 Total Earnings: ${total_earnings:,.0f}" if total_earnings else "💰 Total Earnings: $0")
+        print(f"🏆 Total FedEx Points: {total_fedex:.0f}" if total_fedex else "🏆 Total FedEx Points: 0")
+        print(f"📊 Picks Remaining: {200 - len(rows)}")
+        print("=" * 60)
 
 if __name__ == "__main__":
     view_picks_history()
@@ -17,19 +17,22 @@ def check_weekly_update():
     with sqlite3.connect(db_path) as conn:
         cursor = conn.cursor()
         
-        # Get most recent tournament in database
+        # Most recent tournament in database and total picks, in one query
         cursor.execute("""
-            SELECT tournament_name, tournament_date, COUNT(*) as players
-            FROM tournament_results_2026
-            GROUP BY tournament_name, tournament_date
-            ORDER BY tournament_date DESC
-            LIMIT 1
+            SELECT t.tournament_name, t.tournament_date, t.players, p.picks_count
+            FROM (SELECT COUNT(*) as picks_count FROM picks) p
+            LEFT JOIN (
+                SELECT tournament_name, tournament_date, COUNT(*) as players
+                FROM tournament_results_2026
+                WHERE tournament_date = (SELECT MAX(tournament_date) FROM tournament_results_2026)
+                GROUP BY tournament_name, tournament_date
+                LIMIT 1
+            ) t ON 1
         """)
         
-        last_tournament = cursor.fetchone()
+        name, date, player_count, picks_count = cursor.fetchone()
         
-        if last_tournament:
-            name, date, player_count = last_tournament
+        if name is not None:
             print(f"✅ Last updated tournament:")
             print(f"   {name}")
             print(f"   Date: {date}")
@@ -45,10 +48,6 @@ def check_weekly_update():
             else:
                 print(f"   Updated {days_ago} days ago\n")
         
-        # Get total picks
-        cursor.execute("SELECT COUNT(*) FROM picks")
-        picks_count = cursor.fetchone()[0]
-        
         print(f"📊 Season Status:")
         print(f"   Picks used: {picks_count}/200")
         print(f"   Picks remaining: {200 - picks_count}\n")